@@ -3,9 +3,120 @@
 Demo: Test case generation from JIRA ticket description - FIXED VERSION
 """
 
+import functools
 import json
+import os
+import sys
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Maps test case names to valid method names in a single pass
+_METHOD_NAME_TABLE = str.maketrans({' ': '_', '-': '_', '(': None, ')': None, ',': None})
+
+_SCRIPT_HEADER = '''"""
+Automated Test Cases for JIRA Ticket: {ticket_id}
+Generated by Ultimate Test Automation Coordinator
+"""
+
+import os
+import pytest
+import time
+
+class Test{class_name}:
+    """Test cases for {ticket_id}: Login Functionality"""
+
+'''
+
+_TEST_METHOD_TEMPLATE = '''
+    def test_{method_name}(self):
+        """{name}"""
+        print("Testing: {name}")
+        # Test steps:
+        {steps_block}
+        if os.environ.get("DEMO_SLEEP"):
+            time.sleep(0.5)  # Simulate test execution
+        # Expected: {expected}
+        assert True, "Test implementation pending"
+
+'''
+
+_SCRIPT_FOOTER = '''
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
+'''
+
+# The demo generator is static, so the cases are built once at import
+_TEST_CASE_TEMPLATES = (
+    {
+        "name": "Test successful login with valid credentials",
+        "description": "Verify user can login with correct email and password",
+        "priority": "High",
+        "steps": [
+            "Navigate to login page",
+            "Enter valid email address",
+            "Enter valid password",
+            "Click login button",
+            "Verify redirect to dashboard"
+        ],
+        "expected_result": "User should be logged in and redirected to dashboard"
+    },
+    {
+        "name": "Test login failure with invalid password",
+        "description": "Verify system handles incorrect password appropriately",
+        "priority": "High",
+        "steps": [
+            "Navigate to login page",
+            "Enter valid email address",
+            "Enter invalid password",
+            "Click login button",
+            "Verify error message is displayed"
+        ],
+        "expected_result": "Appropriate error message should be shown"
+    },
+    {
+        "name": "Test login with non-existent email",
+        "description": "Verify system handles non-existent users appropriately",
+        "priority": "Medium",
+        "steps": [
+            "Navigate to login page",
+            "Enter non-existent email address",
+            "Enter any password",
+            "Click login button",
+            "Verify error message is displayed"
+        ],
+        "expected_result": "Appropriate error message should be shown"
+    },
+    {
+        "name": "Test password field masking",
+        "description": "Verify password field obscures input characters",
+        "priority": "Medium",
+        "steps": [
+            "Navigate to login page",
+            "Enter text in password field",
+            "Verify characters are masked"
+        ],
+        "expected_result": "Password characters should be obscured"
+    },
+    {
+        "name": "Test remember me functionality",
+        "description": "Verify remember me checkbox works correctly",
+        "priority": "Low",
+        "steps": [
+            "Navigate to login page",
+            "Enter valid credentials",
+            "Check remember me checkbox",
+            "Click login button",
+            "Logout and revisit login page",
+            "Verify credentials are remembered"
+        ],
+        "expected_result": "Credentials should be pre-filled when remember me is checked"
+    }
+)
+
 def simulate_jira_ticket_analysis(ticket_id="DEMO-123"):
     """Simulate JIRA ticket analysis and test generation"""
 
@@ -30,27 +141,32 @@ def simulate_jira_ticket_analysis(ticket_id="DEMO-123"):
         "labels": ["authentication", "login", "security"]
     }
 
-    print(f"Analyzing JIRA Ticket: {ticket_data['key']}")
-    print(f"Summary: {ticket_data['summary']}")
-    print("\n" + "="*50)
-
-    # Simulate AI analysis
-    print("\n🤖 AI Analysis Results:")
-    print("✓ Detected: Login form functionality")
-    print("✓ Detected: Authentication requirements")
-    print("✓ Detected: Security considerations")
-    print("✓ Detected: Form validation needs")
+    # Collect the report and emit it with a single write
+    out = [
+        f"Analyzing JIRA Ticket: {ticket_data['key']}",
+        f"Summary: {ticket_data['summary']}",
+        "\n" + "="*50,
+        # Simulate AI analysis
+        "\n🤖 AI Analysis Results:",
+        "✓ Detected: Login form functionality",
+        "✓ Detected: Authentication requirements",
+        "✓ Detected: Security considerations",
+        "✓ Detected: Form validation needs"
+    ]
 
     # Generate test cases
     test_cases = generate_test_cases(ticket_data)
 
-    print(f"\n📋 Generated {len(test_cases)} Test Cases:")
-    print("="*50)
+    out.append(f"\n📋 Generated {len(test_cases)} Test Cases:")
+    out.append("="*50)
 
     for i, test_case in enumerate(test_cases, 1):
-        print(f"\n{i}. {test_case['name']}")
-        print(f"   Priority: {test_case['priority']}")
-        print(f"   Description: {test_case['description']}")
+        out.append(f"\n{i}. {test_case['name']}")
+        out.append(f"   Priority: {test_case['priority']}")
+        out.append(f"   Description: {test_case['description']}")
+
+    sys.stdout.write("\n".join(out) + "\n")
+    sys.stdout.flush()
 
     # Save to file
     save_test_cases(test_cases, ticket_id)
@@ -60,77 +176,13 @@ def simulate_jira_ticket_analysis(ticket_id="DEMO-123"):
 def generate_test_cases(ticket_data):
     """Generate test cases based on ticket data"""
 
-    test_cases = [
-        {
-            "name": "Test successful login with valid credentials",
-            "description": "Verify user can login with correct email and password",
-            "priority": "High",
-            "steps": [
-                "Navigate to login page",
-                "Enter valid email address",
-                "Enter valid password",
-                "Click login button",
-                "Verify redirect to dashboard"
-            ],
-            "expected_result": "User should be logged in and redirected to dashboard"
-        },
-        {
-            "name": "Test login failure with invalid password",
-            "description": "Verify system handles incorrect password appropriately",
-            "priority": "High",
-            "steps": [
-                "Navigate to login page",
-                "Enter valid email address",
-                "Enter invalid password",
-                "Click login button",
-                "Verify error message is displayed"
-            ],
-            "expected_result": "Appropriate error message should be shown"
-        },
-        {
-            "name": "Test login with non-existent email",
-            "description": "Verify system handles non-existent users appropriately",
-            "priority": "Medium",
-            "steps": [
-                "Navigate to login page",
-                "Enter non-existent email address",
-                "Enter any password",
-                "Click login button",
-                "Verify error message is displayed"
-            ],
-            "expected_result": "Appropriate error message should be shown"
-        },
-        {
-            "name": "Test password field masking",
-            "description": "Verify password field obscures input characters",
-            "priority": "Medium",
-            "steps": [
-                "Navigate to login page",
-                "Enter text in password field",
-                "Verify characters are masked"
-            ],
-            "expected_result": "Password characters should be obscured"
-        },
-        {
-            "name": "Test remember me functionality",
-            "description": "Verify remember me checkbox works correctly",
-            "priority": "Low",
-            "steps": [
-                "Navigate to login page",
-                "Enter valid credentials",
-                "Check remember me checkbox",
-                "Click login button",
-                "Logout and revisit login page",
-                "Verify credentials are remembered"
-            ],
-            "expected_result": "Credentials should be pre-filled when remember me is checked"
-        }
-    ]
-
-    return test_cases
+    return list(_TEST_CASE_TEMPLATES)
 
 def save_test_cases(test_cases, ticket_id):
-    """Save generated test cases to file"""
+    """Save generated test cases and the matching test script to disk"""
+
+    json_file = f"test_cases_{ticket_id}.json"
+    script_file = f"test_{ticket_id.replace('-', '_')}.py"
 
     output = {
         "ticket_id": ticket_id,
@@ -138,55 +190,81 @@ def save_test_cases(test_cases, ticket_id):
         "test_cases": test_cases
     }
 
-    filename = f"test_cases_{ticket_id}.json"
-    with open(filename, 'w') as f:
-        json.dump(output, f, indent=2)
+    # Compact JSON for tooling; a human-readable copy only on request
+    artifacts = {
+        json_file: serialize_test_cases(output),
+        script_file: generate_test_script(test_cases, ticket_id).encode('utf-8')
+    }
+    pretty_file = None
+    if os.environ.get("DEMO_PRETTY"):
+        pretty_file = f"test_cases_{ticket_id}.pretty.json"
+        artifacts[pretty_file] = serialize_test_cases(output, pretty=True)
 
-    print(f"\n💾 Test cases saved to: {filename}")
+    write_artifacts(artifacts)
 
-    # Also generate a simple test script
-    generate_test_script(test_cases, ticket_id)
+    print(f"\n💾 Test cases saved to: {json_file}")
+    if pretty_file:
+        print(f"💾 Readable copy saved to: {pretty_file}")
+    print(f"📝 Test script generated: {script_file}")
 
-def generate_test_script(test_cases, ticket_id):
-    """Generate a Python test script - FIXED VERSION"""
+def write_artifacts(artifacts):
+    """Write all generated artifacts for a ticket, replacing none unless all are written"""
 
-    script_content = f'''"""
-Automated Test Cases for JIRA Ticket: {ticket_id}
-Generated by Ultimate Test Automation Coordinator
-"""
+    # Each artifact goes to a temporary file first; only once every write has
+    # succeeded are they renamed over the real names, so a failed write never
+    # leaves a half-written file or a mix of old and new artifacts behind.
+    staged = []
+    try:
+        for filename, data in artifacts.items():
+            tmp_name = filename + '.tmp'
+            staged.append(tmp_name)
+            with open(tmp_name, 'wb') as f:
+                f.write(data)
+    except OSError:
+        for tmp_name in staged:
+            try:
+                os.remove(tmp_name)
+            except OSError:
+                pass
+        raise
 
-import pytest
-import time
+    for tmp_name, filename in zip(staged, artifacts):
+        os.replace(tmp_name, filename)
 
-class Test{ticket_id.replace('-', '_')}:
-    """Test cases for {ticket_id}: Login Functionality"""
+    return list(artifacts)
 
-'''
+def serialize_test_cases(output, pretty=False):
+    """Serialize a test case report to JSON bytes"""
 
-    for i, test_case in enumerate(test_cases, 1):
-        method_name = test_case['name'].lower().replace(' ', '_').replace('-', '_').replace('(', '').replace(')', '').replace(',', '')[:30]
-        script_content += f'''
-    def test_{method_name}(self):
-        """{test_case['name']}"""
-        print("Testing: {test_case['name']}")
-        # Test steps:
-        # {chr(10).join(['# ' + step for step in test_case['steps']])}
-        time.sleep(0.5)  # Simulate test execution
-        # Expected: {test_case['expected_result']}
-        assert True, "Test implementation pending"
+    if orjson is not None:
+        return orjson.dumps(output, option=orjson.OPT_INDENT_2 if pretty else None)
+    if pretty:
+        return json.dumps(output, indent=2).encode('utf-8')
+    return json.dumps(output, separators=(',', ':')).encode('utf-8')
 
-'''
+@functools.lru_cache(maxsize=256)
+def _format_steps_block(steps):
+    """Render test steps as the indented comment block of a test method"""
+    return "\n        ".join(["# " + step for step in steps])
 
-    script_content += '''
-if __name__ == "__main__":
-    pytest.main([__file__, "-v"])
-'''
+def generate_test_script(test_cases, ticket_id):
+    """Generate a Python test script - FIXED VERSION"""
+
+    class_name = ticket_id.replace('-', '_')
+    parts = [_SCRIPT_HEADER.format(ticket_id=ticket_id, class_name=class_name)]
 
-    filename = f"test_{ticket_id.replace('-', '_')}.py"
-    with open(filename, 'w') as f:
-        f.write(script_content)
+    for test_case in test_cases:
+        method_name = test_case['name'].lower().translate(_METHOD_NAME_TABLE)[:30]
+        steps_block = _format_steps_block(tuple(test_case['steps']))
+        parts.append(_TEST_METHOD_TEMPLATE.format(
+            method_name=method_name,
+            name=test_case['name'],
+            steps_block=steps_block,
+            expected=test_case['expected_result']
+        ))
 
-    print(f"📝 Test script generated: {filename}")
+    parts.append(_SCRIPT_FOOTER)
+    return "".join(parts)
 
 if __name__ == "__main__":
     simulate_jira_ticket_analysis("DEMO-123")
\ No newline at end of file
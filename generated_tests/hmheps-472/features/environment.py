@@ -1,35 +1,73 @@
 """Environment setup for Behave tests"""
-from behave import fixture, use_fixture
+import atexit
+import os
 from playwright.sync_api import sync_playwright
 
-@fixture
-def browser_context(context):
-    """Set up browser context for tests"""
-    playwright = sync_playwright().start()
-    browser = playwright.chromium.launch(headless=False)
-    context.browser = browser
-    context.page = browser.new_page()
-    yield context.page
-    browser.close()
-    playwright.stop()
+# Playwright and the browser are started once per worker process and shared
+# by every scenario it runs; each scenario only gets its own lightweight
+# browser context. Keying on the pid keeps parallel workers (see
+# run_parallel.py) from ever touching a browser launched by another process.
+_BROWSERS = {}
+
+# Paths of the pages steps can be redirected to, by display name
+PAGE_PATHS = {
+    "My schools → Roster": "/schools/roster",
+    "Home": "/home"
+}
+
+# Feature flags every scenario starts from; copied, never mutated
+DEFAULT_FEATURE_FLAGS = {
+    "welcome-screen": True
+}
+
+def _get_browser():
+    """Launch this process's shared browser on first use"""
+    pid = os.getpid()
+    if pid not in _BROWSERS:
+        playwright = sync_playwright().start()
+        _BROWSERS[pid] = (playwright, playwright.chromium.launch(headless=True))
+        atexit.register(_shutdown_browser)
+    return _BROWSERS[pid][1]
+
+def _shutdown_browser():
+    """Close this process's browser and stop Playwright"""
+    entry = _BROWSERS.pop(os.getpid(), None)
+    if entry is not None:
+        playwright, browser = entry
+        browser.close()
+        playwright.stop()
 
 def before_all(context):
     """Setup before all tests"""
-    use_fixture(browser_context, context)
+    context.browser = _get_browser()
     # Set base URL and other configurations
     context.base_url = "https://your-app-url.com"  # Replace with your application URL
     context.default_timeout = 5000  # 5 seconds timeout
+    # Page names used in steps, resolved to full URLs once
+    context.page_urls = {
+        name: f"{context.base_url}{path}" for name, path in PAGE_PATHS.items()
+    }
 
 def after_all(context):
     """Cleanup after all tests"""
-    if hasattr(context, 'browser'):
-        context.browser.close()
+    _shutdown_browser()
 
 def before_scenario(context, scenario):
     """Setup before each scenario"""
+    # Fresh browser context per scenario so cookies/storage never leak
+    context.browser_context = context.browser.new_context()
+    context.page = context.browser_context.new_page()
+    context.page.set_default_timeout(context.default_timeout)
     # Reset any scenario-specific data
-    context.error_messages = []
+    try:
+        context.error_messages.clear()
+    except AttributeError:
+        context.error_messages = []
     context.current_user = None
-    context.feature_flags = {
-        "welcome-screen": True
-    }
\ No newline at end of file
+    context.feature_flags = DEFAULT_FEATURE_FLAGS.copy()
+
+def after_scenario(context, scenario):
+    """Cleanup after each scenario"""
+    if getattr(context, 'browser_context', None) is not None:
+        context.browser_context.close()
+        context.browser_context = None
@@ -1,13 +1,68 @@
 """Step definitions for Welcome screen tests"""
 from behave import given, when, then
-import time
-from playwright.sync_api import expect
+from playwright.sync_api import expect, Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+
+WELCOME_SELECTOR = '.welcome-message'
+START_SCREEN_SELECTOR = '.lets-get-started'
+LOGIN_USERNAME_SELECTOR = '#username'
+LOGIN_PASSWORD_SELECTOR = '#password'
+LOGIN_BUTTON_SELECTOR = '#login-button'
+
+# Resolves with the milliseconds elapsed until the element stops rendering,
+# or rejects if it is still rendered after timeout milliseconds
+WAIT_FOR_HIDDEN_JS = """([selector, timeout]) => new Promise((resolve, reject) => {
+    const start = performance.now();
+    const isHidden = () => {
+        const el = document.querySelector(selector);
+        return !el || el.offsetParent === null;
+    };
+    if (isHidden()) {
+        resolve(0);
+        return;
+    }
+    const observer = new MutationObserver(() => {
+        if (isHidden()) {
+            observer.disconnect();
+            clearTimeout(timer);
+            resolve(performance.now() - start);
+        }
+    });
+    const timer = setTimeout(() => {
+        observer.disconnect();
+        reject(new Error(`${selector} still visible after ${timeout}ms`));
+    }, timeout);
+    observer.observe(document.body, {subtree: true, attributes: true, childList: true});
+})"""
+
+# True once the element is rendered and contains the expected text
+VISIBLE_WITH_TEXT_JS = """([selector, text]) => {
+    const el = document.querySelector(selector);
+    return !!el && el.offsetParent !== null && el.textContent.includes(text);
+}"""
+
+# Fills the login form and submits it in a single round-trip
+SUBMIT_LOGIN_JS = """([userSel, passSel, buttonSel, username, password]) => {
+    for (const [sel, value] of [[userSel, username], [passSel, password]]) {
+        const input = document.querySelector(sel);
+        input.value = value;
+        input.dispatchEvent(new Event('input', {bubbles: true}));
+        input.dispatchEvent(new Event('change', {bubbles: true}));
+    }
+    document.querySelector(buttonSel).click();
+}"""
+
+def wait_for_visible_text(page, selector, text):
+    """Wait until an element is visible and contains text, in one round-trip"""
+    try:
+        page.wait_for_function(VISIBLE_WITH_TEXT_JS, arg=[selector, text])
+    except PlaywrightTimeoutError:
+        raise AssertionError(f"'{selector}' is not visible with text '{text}'")
 
 @given('the system is running')
 def step_impl(context):
-    context.page.goto(context.base_url)
-    # Verify the page is loaded
-    expect(context.page).to_have_url(context.base_url)
+    # goto raises if navigation fails, so no separate URL check is needed;
+    # the DOM is all later steps rely on, not every subresource
+    context.page.goto(context.base_url, wait_until='domcontentloaded')
 
 @given('the welcome-screen feature flag is enabled by default')
 def step_impl(context):
@@ -33,9 +88,10 @@ def step_impl(context):
 def step_impl(context):
     user = context.test_users['admin_with_roster']
     # Login implementation
-    context.page.fill('#username', user['username'])
-    context.page.fill('#password', user['password'])
-    context.page.click('#login-button')
+    context.page.evaluate(SUBMIT_LOGIN_JS, [
+        LOGIN_USERNAME_SELECTOR, LOGIN_PASSWORD_SELECTOR, LOGIN_BUTTON_SELECTOR,
+        user['username'], user['password']
+    ])
 
 @given('I have never logged into the application before')
 def step_impl(context):
@@ -52,37 +108,37 @@ def step_impl(context):
 @then('I should see a "Welcome {name}" message for {duration:d}ms')
 def step_impl(context, name, duration):
     # Verify welcome message
-    welcome_message = context.page.locator('.welcome-message')
-    expect(welcome_message).to_be_visible()
-    expect(welcome_message).to_contain_text(f"Welcome {name}")
+    wait_for_visible_text(context.page, WELCOME_SELECTOR, f"Welcome {name}")
     
-    # Verify duration
-    start_time = time.time()
-    context.page.wait_for_selector('.welcome-message', state='hidden')
-    end_time = time.time()
-    actual_duration = (end_time - start_time) * 1000
+    # Verify duration, timed in the page by a MutationObserver so the
+    # measurement is not skewed by selector polling or RPC latency
+    try:
+        actual_duration = context.page.evaluate(
+            WAIT_FOR_HIDDEN_JS, [WELCOME_SELECTOR, duration + context.default_timeout]
+        )
+    except PlaywrightError:
+        raise AssertionError(f"'{WELCOME_SELECTOR}' did not disappear after {duration}ms")
     assert abs(actual_duration - duration) < 100  # Allow 100ms tolerance
 
 @then('the screen transitions to "Let\'s Get Started" view')
 def step_impl(context):
-    start_screen = context.page.locator('.lets-get-started')
-    expect(start_screen).to_be_visible()
-    expect(start_screen).to_contain_text("Let's Get Started")
+    wait_for_visible_text(context.page, START_SCREEN_SELECTOR, "Let's Get Started")
 
 @when('I click the "{button_name}" button')
 def step_impl(context, button_name):
-    context.page.click(f'button:text("{button_name}")')
+    context.page.get_by_role('button', name=button_name, exact=True).click(
+        timeout=context.default_timeout
+    )
 
 @then('I am redirected to the "{page_name}" page')
 def step_impl(context, page_name):
-    if page_name == "My schools → Roster":
-        expect(context.page).to_have_url(f"{context.base_url}/schools/roster")
-    elif page_name == "Home":
-        expect(context.page).to_have_url(f"{context.base_url}/home")
+    url = context.page_urls.get(page_name)
+    assert url, f"Unknown page: {page_name}"
+    expect(context.page).to_have_url(url)
 
 @then('no welcome screen is displayed')
 def step_impl(context):
-    welcome_message = context.page.locator('.welcome-message')
+    welcome_message = context.page.locator(WELCOME_SELECTOR)
     expect(welcome_message).not_to_be_visible()
 
 # Add more step definitions for other scenarios...
\ No newline at end of file
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Run the Behave scenarios for this ticket across parallel worker processes.
+
+Scenarios are split round-robin into one ``behave`` process per worker, so
+each worker launches a single private Playwright browser (see
+features/environment.py) and reuses it for every scenario in its share.
+Scenarios are network-bound, so throughput scales close to the worker count.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+FEATURES_DIR = Path(__file__).parent / "features"
+
+# Gherkin keywords that start a scenario, synonyms included; "Examples:"
+# tables belong to their outline and are not matched
+SCENARIO_KEYWORDS = ("Scenario:", "Scenario Outline:", "Scenario Template:", "Example:")
+
+
+def collect_scenarios(features_dir=FEATURES_DIR):
+    """Return ``feature:line`` locations for every scenario"""
+    locations = []
+    for feature in sorted(features_dir.glob("*.feature")):
+        with open(feature, encoding="utf-8") as f:
+            for lineno, line in enumerate(f, 1):
+                if line.lstrip().startswith(SCENARIO_KEYWORDS):
+                    locations.append(f"{feature}:{lineno}")
+    return locations
+
+
+def run_worker(locations):
+    """Run a share of the scenarios in one behave process"""
+    result = subprocess.run(
+        [sys.executable, "-m", "behave", "--no-capture", *locations],
+        cwd=FEATURES_DIR.parent,
+        capture_output=True,
+        text=True
+    )
+    return locations, result.returncode, result.stdout + result.stderr
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run Behave scenarios in parallel")
+    parser.add_argument("-n", "--workers", type=int, default=os.cpu_count() or 1,
+                        help="Number of parallel worker processes")
+    args = parser.parse_args()
+
+    scenarios = collect_scenarios()
+    workers = max(1, min(args.workers, len(scenarios)))
+    shares = [scenarios[i::workers] for i in range(workers)]
+
+    failed = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for locations, returncode, output in executor.map(run_worker, shares):
+            status = "PASSED" if returncode == 0 else "FAILED"
+            print(f"{status}: {len(locations)} scenario(s) in worker")
+            if returncode != 0:
+                failed += 1
+                print(output)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
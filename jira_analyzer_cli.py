@@ -4,10 +4,16 @@ JIRA Ticket Analyzer - Command line interface for analyzing JIRA tickets
 """
 
 import argparse
+import asyncio
 import sys
 import os
 import json
 import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional
 from dotenv import load_dotenv
@@ -15,25 +21,83 @@ from dotenv import load_dotenv
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from src.core import TestCaseGenerator, JIRAClient
-from src.core.playwright_generator import PlaywrightTestGenerator
+from src.utils.helpers import HelperUtils
+
+# The src.core classes pull in heavy dependencies, so they are imported where
+# they are first used rather than here; --help stays fast
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S'
-)
 logger = logging.getLogger(__name__)
 
-# Load environment variables
-load_dotenv(verbose=True)
+# Ticket key in a JIRA browse URL, ignoring any query string or fragment
+_TICKET_URL_RE = re.compile(r'/browse/([A-Z][A-Z0-9]+-\d+)')
+
+# Shape of a ticket key, checked locally before spending a JIRA call on it
+_TICKET_ID_RE = re.compile(r'[A-Z][A-Z0-9]+-\d+')
+
+# Tickets fetched and processed at once by process_batch; JIRA calls are
+# network-bound, so overlapping them matters far more than any CPU work
+BATCH_CONCURRENCY = 8
+
+# Fetched issues kept in memory, and how long before they are re-fetched
+ISSUE_CACHE_MAX_SIZE = 512
+ISSUE_CACHE_TTL_SECONDS = 300
+
+# The only issue fields generation reads, plus 'updated' for cache checks;
+# the acceptance criteria field is added once its ID is known
+ISSUE_FIELDS = ['summary', 'description', 'updated']
+
+# Source of execution.max_parallel_tests, the generation worker count
+DEFAULT_CONFIG_FILE = Path(__file__).parent / 'config' / 'ultimate_test_config.yaml'
+
+def max_parallel_tests() -> int:
+    """Worker processes for test generation, from execution.max_parallel_tests."""
+    default = min(os.cpu_count() or 4, 8)
+    try:
+        import yaml
+        with open(DEFAULT_CONFIG_FILE) as f:
+            config = yaml.safe_load(f) or {}
+        return max(1, int(config.get('execution', {}).get('max_parallel_tests', default)))
+    except (ImportError, OSError, ValueError, TypeError, AttributeError):
+        return default
+        
+def generate_ticket_tests(generator, output_dirs: Dict[str, str], issue_data: Dict,
+                          learning: bool) -> Optional[Dict]:
+    """Generate test cases for an issue, plus Playwright tests when there are any.
+    
+    Args:
+        generator: TestCaseGenerator to use
+        output_dirs: Directories from setup_output_directory
+        issue_data: Issue data from get_jira_issue
+        learning: Whether learning mode is enabled
+        
+    Returns:
+        Generated test cases
+    """
+    test_cases = generator.generate_test_cases(
+        issue_data=issue_data,
+        output_dir=output_dirs['base'],
+        learning_enabled=learning
+    )
+    
+    if test_cases:
+        # Generate Playwright tests if test cases were created
+        from src.core.playwright_generator import PlaywrightTestGenerator
+        playwright_gen = PlaywrightTestGenerator(output_dirs['playwright'])
+        playwright_gen.generate_automation_scripts(test_cases)
+        logger.info("Generated Playwright tests successfully")
+        
+    return test_cases
+    
+# Generator owned by each batch worker process, built once by the initializer
+_worker_generator = None
 
-# Display environment variables (without sensitive values)
-logger.info("Loading JIRA credentials:")
-logger.info(f"JIRA_EMAIL: {'*' * 20}")
-logger.info(f"JIRA_API_TOKEN: {'*' * 10}")
-logger.info(f"JIRA_SERVER: {os.getenv('JIRA_SERVER', 'https://auxworx.atlassian.net')}")
+def _init_generation_worker() -> None:
+    global _worker_generator
+    from src.core import TestCaseGenerator
+    _worker_generator = TestCaseGenerator()
+    
+def _generate_in_worker(output_dirs: Dict[str, str], issue_data: Dict, learning: bool) -> Optional[Dict]:
+    return generate_ticket_tests(_worker_generator, output_dirs, issue_data, learning)
 
 class JiraAnalyzer:
     def __init__(self, output_dir: Path):
@@ -42,36 +106,128 @@ class JiraAnalyzer:
         Args:
             output_dir: Path to output directory
         """
+        from src.core import TestCaseGenerator, JIRAClient
+        
         self.output_dir = Path(output_dir)
         self.generator = TestCaseGenerator()
         self.jira_client = JIRAClient()
         
-    def get_jira_issue(self, ticket_id: str) -> Dict:
+        # ticket_id -> (fetched_at, issue data), least recently used first
+        self._issue_cache = OrderedDict()
+        self._issue_cache_lock = threading.Lock()
+        self.issue_cache_dir = self.output_dir / '.jira_cache'
+        
+    def get_jira_issue(self, ticket_id: str, use_cache: bool = True) -> Dict:
         """Get JIRA issue data.
         
+        Issues are served from memory for ISSUE_CACHE_TTL_SECONDS, then from
+        the on-disk cache as long as JIRA reports the issue unchanged.
+        
         Args:
             ticket_id: JIRA ticket ID
+            use_cache: Set to False to ignore and replace any cached copy
             
         Returns:
             Dictionary containing issue data
         """
+        if use_cache:
+            cached = self._get_cached_issue(ticket_id)
+            if cached is not None:
+                return cached
+                
         try:
-            issue_data = self.jira_client.get_issue_details(ticket_id)
+            issue_data = self.jira_client.get_issue_details(ticket_id, fields=self._issue_fields())
             
             if not issue_data:
                 raise ValueError(f"Could not fetch details for ticket {ticket_id}")
                 
-            return {
-                'key': ticket_id,
-                'summary': issue_data.get('summary', ''),
-                'description': issue_data.get('description', ''),
-                'acceptance_criteria': issue_data.get('acceptance_criteria', '')
-            }
+            issue = self._to_issue(ticket_id, issue_data)
+            self._cache_issue(ticket_id, issue, issue_data.get('updated'))
+            return issue
             
         except Exception as e:
             logger.error(f"Error fetching JIRA issue: {str(e)}", exc_info=True)
             raise
             
+    def prefetch_issues(self, ticket_ids: List[str]) -> None:
+        """Fetch many issues with batched JQL searches and cache them.
+        
+        Tickets the search does not return are left for get_jira_issue to
+        fetch one at a time.
+        
+        Args:
+            ticket_ids: JIRA ticket IDs
+        """
+        with self._issue_cache_lock:
+            missing = [ticket_id for ticket_id in ticket_ids if ticket_id not in self._issue_cache]
+        if not missing:
+            return
+            
+        found = self.jira_client.search_issue_details(missing, fields=self._issue_fields())
+        for ticket_id, issue_data in found.items():
+            self._cache_issue(ticket_id, self._to_issue(ticket_id, issue_data), issue_data.get('updated'))
+        logger.info(f"Prefetched {len(found)} of {len(missing)} tickets")
+        
+    def _issue_fields(self) -> List[str]:
+        """Fields requested from JIRA, so responses carry nothing unused."""
+        return ISSUE_FIELDS + [self.jira_client.acceptance_criteria_field]
+        
+    def _to_issue(self, ticket_id: str, issue_data: Dict) -> Dict:
+        """Keep the parts of JIRAClient issue details used for generation."""
+        return {
+            'key': ticket_id,
+            'summary': issue_data.get('summary', ''),
+            'description': issue_data.get('description', ''),
+            'acceptance_criteria': issue_data.get('acceptance_criteria', '')
+        }
+            
+    def _get_cached_issue(self, ticket_id: str) -> Optional[Dict]:
+        """Return a cached copy of an issue that is still current, if any."""
+        with self._issue_cache_lock:
+            entry = self._issue_cache.get(ticket_id)
+            if entry is not None:
+                if time.monotonic() - entry[0] < ISSUE_CACHE_TTL_SECONDS:
+                    self._issue_cache.move_to_end(ticket_id)
+                    return entry[1]
+                del self._issue_cache[ticket_id]
+                
+        cache_file = self.issue_cache_dir / f"{ticket_id}.json"
+        try:
+            with open(cache_file) as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+            
+        # One tiny request instead of the full issue payload
+        if not cached.get('updated') or cached['updated'] != self.jira_client.get_issue_updated(ticket_id):
+            return None
+            
+        self._remember_issue(ticket_id, cached['issue'])
+        return cached['issue']
+        
+    def _cache_issue(self, ticket_id: str, issue: Dict, updated: Optional[str]) -> None:
+        """Store a freshly fetched issue in memory and on disk."""
+        self._remember_issue(ticket_id, issue)
+        if not updated:
+            return
+            
+        try:
+            self.issue_cache_dir.mkdir(parents=True, exist_ok=True)
+            cache_file = self.issue_cache_dir / f"{ticket_id}.json"
+            tmp_file = cache_file.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_file.write_text(json.dumps({'updated': updated, 'issue': issue}))
+            os.replace(tmp_file, cache_file)
+        except OSError as e:
+            logger.warning(f"Could not cache issue {ticket_id}: {str(e)}")
+            
+    def _remember_issue(self, ticket_id: str, issue: Dict) -> None:
+        """Keep an issue in the in-memory LRU cache."""
+        with self._issue_cache_lock:
+            self._issue_cache[ticket_id] = (time.monotonic(), issue)
+            self._issue_cache.move_to_end(ticket_id)
+            while len(self._issue_cache) > ISSUE_CACHE_MAX_SIZE:
+                self._issue_cache.popitem(last=False)
+            
     def setup_output_directory(self, ticket_id: str) -> Dict[str, str]:
         """Setup output directory structure for a ticket.
         
@@ -81,16 +237,27 @@ class JiraAnalyzer:
         Returns:
             Dictionary of created directory paths
         """
+        base = self.output_dir / ticket_id
         dirs = {
-            'base': self.output_dir / ticket_id,
-            'tests': self.output_dir / ticket_id / 'tests',
-            'playwright': self.output_dir / ticket_id / 'playwright',
-            'reports': self.output_dir / ticket_id / 'reports'
+            'base': base,
+            'tests': base / 'tests',
+            'playwright': base / 'playwright',
+            'reports': base / 'reports'
         }
         
-        for dir_path in dirs.values():
-            dir_path.mkdir(parents=True, exist_ok=True)
+        # One listing tells which subdirectories a rerun already has; only
+        # a new ticket needs its parent chain created
+        try:
+            with os.scandir(base) as entries:
+                existing = {entry.name for entry in entries if entry.is_dir()}
+        except FileNotFoundError:
+            base.mkdir(parents=True, exist_ok=True)
+            existing = set()
             
+        for sub in ('tests', 'playwright', 'reports'):
+            if sub not in existing:
+                dirs[sub].mkdir(exist_ok=True)
+                
         return {k: str(v) for k, v in dirs.items()}
         
     def process_ticket(self, ticket_id: str, options: Dict) -> Optional[Dict]:
@@ -108,24 +275,16 @@ class JiraAnalyzer:
             output_dirs = self.setup_output_directory(ticket_id)
             
             # Get issue data
-            issue_data = self.get_jira_issue(ticket_id)
+            issue_data = self.get_jira_issue(ticket_id, use_cache=not options.get('no_cache', False))
             
             if not issue_data:
                 raise ValueError(f"Could not fetch details for ticket {ticket_id}")
                 
-            # Generate test cases
-            test_cases = self.generator.generate_test_cases(
-                issue_data=issue_data,
-                output_dir=output_dirs['base'],
-                learning_enabled=options.get('learning', True)
+            # Generate test cases, then Playwright tests for them
+            test_cases = generate_ticket_tests(
+                self.generator, output_dirs, issue_data, options.get('learning', True)
             )
             
-            if test_cases:
-                # Generate Playwright tests if test cases were created
-                playwright_gen = PlaywrightTestGenerator(output_dirs['playwright'])
-                playwright_gen.generate_automation_scripts(test_cases)
-                logger.info("Generated Playwright tests successfully")
-                
             logger.info(f"Test scripts generated successfully for {ticket_id}")
             return test_cases
             
@@ -141,16 +300,67 @@ class JiraAnalyzer:
         """
         try:
             with open(batch_file) as f:
-                tickets = [line.strip() for line in f if line.strip()]
+                lines = [line.strip() for line in f.read().splitlines()]
                 
-            for ticket in tickets:
-                logger.info(f"Processing ticket: {ticket}")
-                self.process_ticket(ticket, {'learning': True})
+            # JIRA keys are case-insensitive, so normalize before validating;
+            # duplicates would only repeat the same JIRA calls; keep file order
+            listed = [line.upper() for line in lines if line]
+            tickets = list(dict.fromkeys(listed))
+            if len(tickets) < len(listed):
+                logger.info(f"Skipping {len(listed) - len(tickets)} duplicate tickets in {batch_file}")
+                
+            invalid = [ticket for ticket in tickets if not _TICKET_ID_RE.fullmatch(ticket)]
+            if invalid:
+                logger.warning(f"Skipping {len(invalid)} lines that are not ticket IDs: {', '.join(invalid)}")
+                tickets = [ticket for ticket in tickets if _TICKET_ID_RE.fullmatch(ticket)]
+                
+            self.prefetch_issues(tickets)
+            fetched = asyncio.run(self._fetch_batch_async(tickets))
+            failed = [ticket for ticket, issue in zip(tickets, fetched) if isinstance(issue, Exception)]
+            
+            # Generation is CPU-bound, so it runs in worker processes, each
+            # with its own generator, instead of threads sharing the GIL
+            ready = [(ticket, issue) for ticket, issue in zip(tickets, fetched) if not isinstance(issue, Exception)]
+            if ready:
+                with ProcessPoolExecutor(max_workers=min(max_parallel_tests(), len(ready)),
+                                         initializer=_init_generation_worker) as executor:
+                    futures = [
+                        (ticket, executor.submit(_generate_in_worker, self.setup_output_directory(ticket), issue, True))
+                        for ticket, issue in ready
+                    ]
+                    for ticket, future in futures:
+                        try:
+                            future.result()
+                            logger.info(f"Test scripts generated successfully for {ticket}")
+                        except Exception as e:
+                            logger.error(f"Error processing ticket {ticket}: {str(e)}")
+                            failed.append(ticket)
+                            
+            if failed:
+                raise RuntimeError(f"{len(failed)} of {len(tickets)} tickets failed: {', '.join(failed)}")
                 
         except Exception as e:
             logger.error(f"Error processing batch file: {str(e)}")
             sys.exit(1)
             
+    async def _fetch_batch_async(self, tickets: List[str]) -> List:
+        """Fetch tickets concurrently, at most BATCH_CONCURRENCY at a time.
+        
+        Args:
+            tickets: JIRA ticket IDs
+            
+        Returns:
+            Per-ticket issue data in input order, exceptions included
+        """
+        semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+        
+        async def fetch(ticket: str):
+            async with semaphore:
+                logger.info(f"Processing ticket: {ticket}")
+                return await asyncio.to_thread(self.get_jira_issue, ticket)
+                
+        return await asyncio.gather(*(fetch(ticket) for ticket in tickets), return_exceptions=True)
+            
     def validate_and_process_ticket(self, ticket_id: str) -> bool:
         """Validate and process a ticket if accessible.
         
@@ -160,6 +370,11 @@ class JiraAnalyzer:
         Returns:
             bool: True if ticket was processed successfully
         """
+        ticket_id = ticket_id.upper()
+        if not _TICKET_ID_RE.fullmatch(ticket_id):
+            logger.error(f"{ticket_id} is not a valid ticket ID")
+            return False
+            
         try:
             # Check if ticket is valid and accessible
             if not self.jira_client.validator.is_ticket_accessible(ticket_id):
@@ -192,7 +407,8 @@ class JiraAnalyzer:
                     
                 options = {
                     'learning': not args.no_learning,
-                    'format': args.format
+                    'format': args.format,
+                    'no_cache': args.no_cache
                 }
                 
                 self.process_ticket(ticket_id, options)
@@ -213,10 +429,12 @@ class JiraAnalyzer:
         if not url:
             return None
             
-        try:
-            return url.split('/')[-1]
-        except:
-            return None
+        match = _TICKET_URL_RE.search(url)
+        if match:
+            return match.group(1)
+            
+        # Other URL shapes, and bare IDs, end with the key
+        return url.rsplit('/', 1)[-1].partition('?')[0].partition('#')[0] or None
 
 def main():
     """Main entry point for the CLI."""
@@ -228,9 +446,21 @@ def main():
     parser.add_argument("--format", default="all", choices=["all", "feature", "pytest"], help="Output format")
     parser.add_argument("--batch-file", help="Path to file containing list of ticket IDs")
     parser.add_argument("--no-learning", action="store_true", help="Disable learning mode")
+    parser.add_argument("--no-cache", action="store_true", help="Re-fetch tickets from JIRA instead of using cached copies")
     
     args = parser.parse_args()
     
+    # Process-wide setup happens here, not at import, so importing this
+    # module (tests, the other CLI) has no side effects
+    HelperUtils.setup_logging()
+    load_dotenv(verbose=True)
+    
+    # Display environment variables (without sensitive values)
+    logger.info("Loading JIRA credentials:")
+    logger.info(f"JIRA_EMAIL: {'*' * 20}")
+    logger.info(f"JIRA_API_TOKEN: {'*' * 10}")
+    logger.info(f"JIRA_SERVER: {os.getenv('JIRA_SERVER', 'https://auxworx.atlassian.net')}")
+    
     # Create analyzer instance
     analyzer = JiraAnalyzer(Path(args.output_dir))
     
@@ -2,10 +2,12 @@
 """Command line interface for JIRA ticket analysis and test case generation."""
 
 import argparse
+import asyncio
 import sys
 import os
 import json
 import logging
+import re
 from pathlib import Path
 from typing import Dict, List, Optional
 from dotenv import load_dotenv
@@ -13,27 +15,29 @@ from dotenv import load_dotenv
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from src.core import TestCaseGenerator, JIRAClient
-from src.core.test_case_analyzer import TestCaseAnalyzer
 from src.utils.config import Config
+from src.utils.helpers import HelperUtils
 
-# Load environment variables
-load_dotenv(verbose=True)
+logger = logging.getLogger(__name__)
 
-# Initialize logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S'
-)
+# Ticket key in a JIRA browse URL, ignoring any query string or fragment
+_TICKET_URL_RE = re.compile(r'/browse/([A-Z][A-Z0-9]+-\d+)')
 
-logger = logging.getLogger(__name__)
+# Shape of a ticket key, checked locally before spending a JIRA call on it
+_TICKET_ID_RE = re.compile(r'[A-Z][A-Z0-9]+-\d+')
+
+# Tickets fetched and processed at once by process_batch; JIRA calls are
+# network-bound, so overlapping them matters far more than any CPU work
+BATCH_CONCURRENCY = 8
 
 class TestCaseGeneratorCLI:
     """Command line interface for test case generation."""
     
     def __init__(self):
         """Initialize CLI with configuration."""
+        # Heavy imports deferred until a CLI is actually built, not on --help
+        from src.core import TestCaseGenerator, JIRAClient
+        
         self.config = Config()
         if not self.config.validate():
             sys.exit(1)
@@ -41,6 +45,9 @@ class TestCaseGeneratorCLI:
         self.generator = TestCaseGenerator()
         self.output_dir = self.config.output_dir
         
+        # One authenticated client, and its connection pool, for every ticket
+        self.jira_client = JIRAClient(self.config.jira_config)
+        
     def setup_output_directory(self, ticket_id: str) -> Dict[str, str]:
         """Setup output directory structure for a ticket.
         
@@ -50,16 +57,27 @@ class TestCaseGeneratorCLI:
         Returns:
             Dictionary of created directory paths
         """
+        base = self.output_dir / ticket_id
         dirs = {
-            'base': self.output_dir / ticket_id,
-            'tests': self.output_dir / ticket_id / 'tests',
-            'playwright': self.output_dir / ticket_id / 'playwright',
-            'reports': self.output_dir / ticket_id / 'reports'
+            'base': base,
+            'tests': base / 'tests',
+            'playwright': base / 'playwright',
+            'reports': base / 'reports'
         }
         
-        for dir_path in dirs.values():
-            dir_path.mkdir(parents=True, exist_ok=True)
+        # One listing tells which subdirectories a rerun already has; only
+        # a new ticket needs its parent chain created
+        try:
+            with os.scandir(base) as entries:
+                existing = {entry.name for entry in entries if entry.is_dir()}
+        except FileNotFoundError:
+            base.mkdir(parents=True, exist_ok=True)
+            existing = set()
             
+        for sub in ('tests', 'playwright', 'reports'):
+            if sub not in existing:
+                dirs[sub].mkdir(exist_ok=True)
+                
         return {k: str(v) for k, v in dirs.items()}
         
     def process_ticket(self, ticket_id: str, options: Dict) -> None:
@@ -74,8 +92,10 @@ class TestCaseGeneratorCLI:
             output_dirs = self.setup_output_directory(ticket_id)
             
             # Get ticket data
-            jira_client = JIRAClient(self.config.jira_config)
-            issue_data = jira_client.get_issue(ticket_id)
+            issue_data = self.jira_client.get_issue_details(ticket_id)
+            
+            if not issue_data:
+                raise ValueError(f"Could not fetch details for ticket {ticket_id}")
             
             # Generate test cases
             test_cases = self.generator.generate_test_cases(
@@ -99,16 +119,47 @@ class TestCaseGeneratorCLI:
         """
         try:
             with open(batch_file) as f:
-                tickets = [line.strip() for line in f if line.strip()]
+                lines = [line.strip() for line in f.read().splitlines()]
                 
-            for ticket in tickets:
-                logger.info(f"Processing ticket: {ticket}")
-                self.process_ticket(ticket, {'learning': True})
+            # JIRA keys are case-insensitive, so normalize before validating;
+            # duplicates would only repeat the same JIRA calls; keep file order
+            listed = [line.upper() for line in lines if line]
+            tickets = list(dict.fromkeys(listed))
+            if len(tickets) < len(listed):
+                logger.info(f"Skipping {len(listed) - len(tickets)} duplicate tickets in {batch_file}")
+                
+            invalid = [ticket for ticket in tickets if not _TICKET_ID_RE.fullmatch(ticket)]
+            if invalid:
+                logger.warning(f"Skipping {len(invalid)} lines that are not ticket IDs: {', '.join(invalid)}")
+                tickets = [ticket for ticket in tickets if _TICKET_ID_RE.fullmatch(ticket)]
+                
+            results = asyncio.run(self._process_batch_async(tickets))
+            failed = [ticket for ticket, result in zip(tickets, results) if isinstance(result, Exception)]
+            if failed:
+                raise RuntimeError(f"{len(failed)} of {len(tickets)} tickets failed: {', '.join(failed)}")
                 
         except Exception as e:
             logger.error(f"Error processing batch file: {str(e)}")
             sys.exit(1)
             
+    async def _process_batch_async(self, tickets: List[str]) -> List:
+        """Process tickets concurrently, at most BATCH_CONCURRENCY at a time.
+        
+        Args:
+            tickets: JIRA ticket IDs
+            
+        Returns:
+            Per-ticket results in input order, exceptions included
+        """
+        semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+        
+        async def process(ticket: str):
+            async with semaphore:
+                logger.info(f"Processing ticket: {ticket}")
+                return await asyncio.to_thread(self.process_ticket, ticket, {'learning': True})
+                
+        return await asyncio.gather(*(process(ticket) for ticket in tickets), return_exceptions=True)
+            
     def run(self, args: argparse.Namespace) -> None:
         """Run the CLI with provided arguments.
         
@@ -148,10 +199,12 @@ class TestCaseGeneratorCLI:
             return None
             
         # Extract ticket ID from URL
-        try:
-            return url.split('/')[-1]
-        except:
-            return None
+        match = _TICKET_URL_RE.search(url)
+        if match:
+            return match.group(1)
+            
+        # Other URL shapes, and bare IDs, end with the key
+        return url.rsplit('/', 1)[-1].partition('?')[0].partition('#')[0] or None
 
 def parse_args() -> argparse.Namespace:
     """Parse command line arguments.
@@ -199,6 +252,11 @@ def main():
     """Main entry point for the CLI."""
     try:
         args = parse_args()
+        
+        # Process-wide setup happens here, not at import
+        HelperUtils.setup_logging()
+        load_dotenv(verbose=True)
+        
         cli = TestCaseGeneratorCLI()
         cli.run(args)
     except KeyboardInterrupt:
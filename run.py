@@ -4,28 +4,27 @@ Ultimate AI Test Automation Coordinator - Command Line Interface
 """
 
 import argparse
+import importlib.util
 import sys
 import os
 import logging
 
-def check_dependencies():
-    """Check if required dependencies are installed"""
-    missing_deps = []
-
-    try:
-        import yaml
-    except ImportError:
-        missing_deps.append("pyyaml")
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-    try:
-        import crewai
-    except ImportError:
-        missing_deps.append("crewai")
+# (package to install, module it provides)
+REQUIRED_DEPENDENCIES = [("pyyaml", "yaml"), ("crewai", "crewai"), ("jira", "jira")]
 
-    try:
-        import jira
-    except ImportError:
-        missing_deps.append("jira")
+def check_dependencies():
+    """Check if required dependencies are installed"""
+    # find_spec locates a module without importing it, so this stays fast
+    # even for heavy packages like crewai
+    missing_deps = [
+        package for package, module in REQUIRED_DEPENDENCIES
+        if importlib.util.find_spec(module) is None
+    ]
 
     if missing_deps:
         print("Error: The following dependencies are missing:")
@@ -41,15 +40,10 @@ def main():
     if not check_dependencies():
         sys.exit(1)
 
-    # Now import the rest of the modules
     try:
         # Add the src directory to the Python path
         sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-        from src.main import UltimateTestCoordinator
-        from src.core.config_manager import UltimateConfigManager
-        from src.utils.helpers import HelperUtils
-
         parser = argparse.ArgumentParser(
             description='Ultimate AI Test Automation Coordinator',
             formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -110,6 +104,12 @@ Examples:
             print("Error: --target is required when using --test-type")
             sys.exit(1)
 
+        # Import the heavy modules only once there is work to do, so --help
+        # and argument errors don't pay for them
+        from src.main import UltimateTestCoordinator
+        from src.core.config_manager import UltimateConfigManager
+        from src.utils.helpers import HelperUtils
+
         # Setup logging
         logger = HelperUtils.setup_logging()
 
@@ -130,8 +130,8 @@ Examples:
             else:
                 report = coordinator.generate_test_report(results, "html")
                 report_file = f"reports/test_report_{HelperUtils.generate_unique_id()}.html"
-                with open(report_file, "w", encoding="utf-8") as f:
-                    f.write(report)
+                with open(report_file, "wb") as f:
+                    f.write(report.encode("utf-8"))
                 print(f"HTML report generated: {report_file}")
 
                 # Show summary
@@ -147,8 +147,13 @@ Examples:
             results = coordinator.run_targeted_test(args.test_type, args.target)
 
             if args.report_format == "json":
-                import json
-                print(json.dumps(results, indent=2))
+                if orjson is not None:
+                    sys.stdout.flush()
+                    sys.stdout.buffer.write(orjson.dumps(results, option=orjson.OPT_INDENT_2) + b"\n")
+                    sys.stdout.buffer.flush()
+                else:
+                    import json
+                    print(json.dumps(results, indent=2))
             else:
                 print(f"\nTargeted Test Results ({args.test_type}):")
                 print(f"  Target: {args.target}")
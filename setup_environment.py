@@ -5,65 +5,14 @@ Setup script for Ultimate AI Test Automation Coordinator
 
 import os
 import sys
+import shutil
 import subprocess
 import venv
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-def create_virtual_environment():
-    """Create virtual environment if it doesn't exist"""
-    venv_path = Path("venv")
-    if not venv_path.exists():
-        print("Creating virtual environment...")
-        venv.create(venv_path, with_pip=True)
-        print("Virtual environment created.")
-    else:
-        print("Virtual environment already exists.")
-
-def install_dependencies():
-    """Install required dependencies"""
-    # Determine the pip executable path
-    if os.name == 'nt':  # Windows
-        pip_path = Path("venv/Scripts/pip.exe")
-    else:  # Unix/Linux/Mac
-        pip_path = Path("venv/bin/pip")
-
-    if not pip_path.exists():
-        print("Error: pip not found in virtual environment")
-        return False
-
-    # Install requirements
-    requirements_file = Path("requirements.txt")
-    if requirements_file.exists():
-        print("Installing dependencies from requirements.txt...")
-        subprocess.run([str(pip_path), "install", "-r", "requirements.txt"], check=True)
-    else:
-        print("requirements.txt not found. Installing core dependencies...")
-        core_deps = [
-            "crewai==0.28.8", "crewai-tools==0.1.6", "google-generativeai==0.3.2",
-            "jira==3.6.0", "pytest==7.4.3", "playwright==1.39.0", "pytest-html==4.0.2",
-            "requests==2.31.0", "faker==19.6.2", "pyyaml==6.0.1", "pytest-xvfb==2.0.0",
-            "selenium==4.15.0", "webdriver-manager==4.0.1", "beautifulsoup4==4.12.2",
-            "aiohttp==3.9.1", "asyncio-throttle==1.0.2", "pandas==2.1.1", "numpy==1.25.2",
-            "matplotlib==3.7.2", "seaborn==0.12.2", "plotly==5.17.0", "dash==2.14.1"
-        ]
-        subprocess.run([str(pip_path), "install"] + core_deps, check=True)
-
-    print("Dependencies installed successfully.")
-    return True
-
-def setup_directories():
-    """Create necessary directories"""
-    directories = ["logs", "reports", "test_data", "screenshots", "test_sessions", "config"]
-    for directory in directories:
-        Path(directory).mkdir(exist_ok=True)
-        print(f"Created directory: {directory}")
-
-def create_default_config():
-    """Create default configuration file if it doesn't exist"""
-    config_path = Path("config/ultimate_test_config.yaml")
-    if not config_path.exists():
-        config_path.parent.mkdir(exist_ok=True)
-        default_config = """execution:
+# Written to config/ultimate_test_config.yaml on first setup
+_DEFAULT_CONFIG_YAML = """execution:
   mode: adaptive
   max_parallel_tests: 8
   timeout_base: 30
@@ -136,8 +85,73 @@ test_scenarios:
       - failed
       - denied
 """
-        with open(config_path, "w") as f:
-            f.write(default_config)
+
+def create_virtual_environment():
+    """Create virtual environment if it doesn't exist"""
+    venv_path = Path("venv")
+    if not venv_path.exists():
+        print("Creating virtual environment...")
+        venv.create(venv_path, with_pip=True)
+        print("Virtual environment created.")
+    else:
+        print("Virtual environment already exists.")
+
+def install_dependencies():
+    """Install required dependencies"""
+    # Determine the pip executable path
+    if os.name == 'nt':  # Windows
+        pip_path = Path("venv/Scripts/pip.exe")
+        python_path = Path("venv/Scripts/python.exe")
+    else:  # Unix/Linux/Mac
+        pip_path = Path("venv/bin/pip")
+        python_path = Path("venv/bin/python")
+
+    if not pip_path.exists():
+        print("Error: pip not found in virtual environment")
+        return False
+
+    # uv resolves and downloads in parallel, far faster than pip; otherwise
+    # have pip take prebuilt wheels rather than building from source
+    uv_path = shutil.which("uv")
+    if uv_path:
+        install_cmd = [uv_path, "pip", "install", "--python", str(python_path)]
+    else:
+        install_cmd = [str(pip_path), "install", "--prefer-binary"]
+
+    # Install requirements
+    requirements_file = Path("requirements.txt")
+    if requirements_file.exists():
+        print("Installing dependencies from requirements.txt...")
+        subprocess.run(install_cmd + ["-r", "requirements.txt"], check=True)
+    else:
+        print("requirements.txt not found. Installing core dependencies...")
+        core_deps = [
+            "crewai==0.28.8", "crewai-tools==0.1.6", "google-generativeai==0.3.2",
+            "jira==3.6.0", "pytest==7.4.3", "playwright==1.39.0", "pytest-html==4.0.2",
+            "requests==2.31.0", "faker==19.6.2", "pyyaml==6.0.1", "pytest-xvfb==2.0.0",
+            "selenium==4.15.0", "webdriver-manager==4.0.1", "beautifulsoup4==4.12.2",
+            "aiohttp==3.9.1", "asyncio-throttle==1.0.2", "pandas==2.1.1", "numpy==1.25.2",
+            "matplotlib==3.7.2", "seaborn==0.12.2", "plotly==5.17.0", "dash==2.14.1",
+            "orjson==3.9.10"
+        ]
+        subprocess.run(install_cmd + core_deps, check=True)
+
+    print("Dependencies installed successfully.")
+    return True
+
+def setup_directories():
+    """Create necessary directories"""
+    directories = ["logs", "reports", "test_data", "screenshots", "test_sessions", "config"]
+    for directory in directories:
+        Path(directory).mkdir(exist_ok=True)
+        print(f"Created directory: {directory}")
+
+def create_default_config():
+    """Create default configuration file if it doesn't exist"""
+    # config/ itself is created by setup_directories()
+    config_path = Path("config/ultimate_test_config.yaml")
+    if not config_path.exists():
+        config_path.write_text(_DEFAULT_CONFIG_YAML, encoding="utf-8")
         print("Default configuration file created.")
 
 def main():
@@ -145,9 +159,13 @@ def main():
     print("Setting up Ultimate AI Test Automation Coordinator...")
 
     try:
-        create_virtual_environment()
-        setup_directories()
-        create_default_config()
+        # Creating the venv is the slow step and touches nothing the
+        # directory/config setup does, so the two run side by side
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            venv_created = executor.submit(create_virtual_environment)
+            setup_directories()
+            create_default_config()
+            venv_created.result()
 
         # Install dependencies
         if install_dependencies():
@@ -0,0 +1,10 @@
+"""AI agents for the test automation framework."""
+
+import functools
+
+
+@functools.lru_cache(maxsize=None)
+def shared_llm(temperature: float):
+    """Return the OpenAI LLM shared by every agent using this temperature"""
+    from langchain.llms import OpenAI
+    return OpenAI(temperature=temperature)
@@ -1,21 +1,99 @@
+import asyncio
+import random
+import threading
+import time
+import traceback
+import tracemalloc
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+import psutil
 from crewai import Agent
 from langchain.tools import tool
-from langchain.llms import OpenAI
-from typing import List, Dict
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterable, List, Dict, Optional
 from ..core.config_manager import config, logger
+from . import shared_llm
 from ..core.performance_monitor import PerformanceMonitor
 from ..core.circuit_breaker import CircuitBreakerManager
 
+# Dependency probe results are reused for this long, so a batch of tests
+# sharing a database or API dependency probes it once
+DEPENDENCY_CHECK_TTL_SECONDS = 30
+
+# Sampled for every test, so built once rather than per call
+_PROCESS = psutil.Process()
+
+
+@lru_cache(maxsize=256)
+def _dependency_kind(dependency: str) -> str:
+    """Canonical kind of a test precondition: database, api, user or other"""
+    dependency_lc = dependency.lower()
+    for kind in ('database', 'api', 'user'):
+        if kind in dependency_lc:
+            return kind
+    return 'other'
+
+
+def _run_coroutine(coro):
+    """Run a coroutine to completion from sync code, even under a running event loop"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    # asyncio.run cannot nest (async agent runtimes, Jupyter), so the
+    # coroutine gets a private loop on a worker thread instead
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
+class _CpuTimed:
+    """Awaitable running a coroutine and summing the thread CPU time of each step
+
+    Tests share the event loop thread, so timing the whole await would also
+    count whatever other tests ran while this one was suspended.
+    """
+
+    def __init__(self, coro):
+        self._coro = coro
+        self.cpu_time = 0.0
+
+    def __await__(self):
+        send, error = None, None
+        while True:
+            start = time.thread_time()
+            try:
+                if error is None:
+                    awaited = self._coro.send(send)
+                else:
+                    awaited = self._coro.throw(error)
+            except StopIteration as stop:
+                return stop.value
+            finally:
+                self.cpu_time += time.thread_time() - start
+            try:
+                send, error = (yield awaited), None
+            except BaseException as e:
+                send, error = None, e
+
 
 class ExecutionOrchestratorAgent:
     """AI Agent for orchestrating test execution with optimization"""
 
+    _DEPENDENCY_PROBES = {
+        'database': '_check_database_connection',
+        'api': '_check_api_availability',
+        'user': '_check_user_exists'
+    }
+
     def __init__(self):
-        self.llm = OpenAI(temperature=0.1)
+        self.llm = shared_llm(0.1)
         self.performance_monitor = PerformanceMonitor()
         self.circuit_breaker = CircuitBreakerManager()
-        self.executor = ThreadPoolExecutor(max_workers=config.get('execution.max_parallel_tests', 4))
+        self.max_parallel = config.get('execution.max_parallel_tests', 4)
+        self._probe_results = {}
+        self._probe_lock = threading.Lock()
         self.agent = self._create_agent()
 
     def _create_agent(self) -> Agent:
@@ -46,44 +124,76 @@ class ExecutionOrchestratorAgent:
 
         self.performance_monitor.start_monitoring()
 
+        # Allocation tracing is opt-in (PYTHONTRACEMALLOC / -X tracemalloc) as it
+        # slows every allocation; when on, report the batch's traced peak
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+
         try:
-            future_to_test = {
-                self.executor.submit(self._execute_single_test, test_case): test_case
-                for test_case in test_cases
-            }
-
-            for future in as_completed(future_to_test):
-                test_case = future_to_test[future]
-                try:
-                    result = future.result()
-                    results['detailed_results'].append(result)
-
-                    if result['status'] == 'passed':
-                        results['passed'] += 1
-                    elif result['status'] == 'failed':
-                        results['failed'] += 1
-                    else:
-                        results['skipped'] += 1
-
-                except Exception as e:
-                    logger.error(f"Test execution failed for {test_case.get('name')}: {e}")
-                    results['failed'] += 1
-                    results['detailed_results'].append({
+            detailed = [None] * len(test_cases)
+
+            # Tests needing a dependency whose breaker is already open are
+            # skipped up front rather than each re-probing a dead dependency
+            runnable = []
+            open_by_dependencies = {}
+            for index, test_case in enumerate(test_cases):
+                dependencies = tuple(test_case.get('dependencies', []))
+                if dependencies not in open_by_dependencies:
+                    open_by_dependencies[dependencies] = self._open_dependency(dependencies)
+
+                open_dependency = open_by_dependencies[dependencies]
+                if open_dependency:
+                    detailed[index] = {
+                        'name': test_case.get('name'),
+                        'status': 'skipped',
+                        'reason': f"circuit open: {open_dependency}"
+                    }
+                else:
+                    runnable.append(index)
+
+            outcomes = _run_coroutine(self._execute_tests_async([test_cases[index] for index in runnable]))
+
+            # Outcomes arrive in submit order; tally statuses in one pass at the end
+            for index, result in zip(runnable, outcomes):
+                test_case = test_cases[index]
+                if isinstance(result, Exception):
+                    logger.error(f"Test execution failed for {test_case.get('name')}: {result}")
+                    result = {
                         'name': test_case.get('name'),
                         'status': 'error',
-                        'error': str(e)
-                    })
+                        'error': str(result)
+                    }
+                detailed[index] = result
+            results['detailed_results'] = detailed
+
+            counts = Counter(result['status'] for result in detailed)
+            results['passed'] = counts['passed']
+            results['failed'] = counts['failed'] + counts['error']
+            results['skipped'] = len(detailed) - results['passed'] - results['failed']
 
         finally:
             self.performance_monitor.stop_monitoring()
             results['performance_report'] = self.performance_monitor.get_performance_report()
             results['execution_time'] = sum(r.get('execution_time', 0) for r in results['detailed_results'])
+            if tracemalloc.is_tracing():
+                results['traced_memory_peak'] = tracemalloc.get_traced_memory()[1] / 1024 / 1024
 
         return results
 
-    def _execute_single_test(self, test_case: Dict) -> Dict:
+    async def _execute_tests_async(self, test_cases: List[Dict]) -> List:
+        """Run test cases concurrently, at most max_parallel at a time"""
+        semaphore = asyncio.Semaphore(max(1, self.max_parallel))
+
+        async def run(test_case: Dict):
+            async with semaphore:
+                return await self._execute_single_test(test_case)
+
+        return await asyncio.gather(*(run(test_case) for test_case in test_cases), return_exceptions=True)
+
+    async def _execute_single_test(self, test_case: Dict) -> Dict:
         """Execute a single test case with comprehensive monitoring"""
         start_time = time.time()
+        measured = {}
         result = {
             'name': test_case['name'],
             'start_time': datetime.now().isoformat(),
@@ -93,18 +203,24 @@ class ExecutionOrchestratorAgent:
         }
 
         try:
-            if not self._check_preconditions(test_case.get('dependencies', [])):
+            # Dependency probes and blocking test bodies run in worker threads
+            # while the event loop keeps other tests moving
+            if not await asyncio.to_thread(self._check_preconditions, test_case.get('dependencies', [])):
                 result['status'] = 'skipped'
                 result['reason'] = 'Preconditions not met'
                 return result
 
             logger.info(f"Executing test: {test_case['name']}")
 
-            test_result = self.circuit_breaker.protected_call(
-                f"test_{test_case['name']}",
-                self._run_test_implementation,
-                test_case
-            )
+            if asyncio.iscoroutinefunction(self._run_test_implementation):
+                test_result = await self.circuit_breaker.protected_call_async(
+                    f"test_{test_case['name']}",
+                    self._run_measured_async,
+                    test_case,
+                    measured
+                )
+            else:
+                test_result = await asyncio.to_thread(self._run_measured, test_case, measured)
 
             result.update(test_result)
             result['status'] = 'passed'
@@ -112,19 +228,45 @@ class ExecutionOrchestratorAgent:
         except Exception as e:
             result['status'] = 'failed'
             result['error'] = str(e)
-            result['stack_trace'] = self._get_stack_trace()
+            result['stack_trace'] = self._get_stack_trace(e)
 
         finally:
             end_time = time.time()
             result['execution_time'] = end_time - start_time
             result['end_time'] = datetime.now().isoformat()
-            result['performance_metrics'] = self._collect_performance_metrics()
+            result['performance_metrics'] = self._collect_performance_metrics(measured.get('cpu_time', 0.0))
 
         return result
 
-    def _run_test_implementation(self, test_case: Dict) -> Dict:
-        """Actual test implementation - to be overridden by specific test frameworks"""
-        time.sleep(random.uniform(0.1, 2.0))
+    def _run_measured(self, test_case: Dict, measured: Dict) -> Dict:
+        """Run a blocking test through the circuit breaker, recording its CPU time in measured"""
+        cpu_start = time.thread_time()
+        try:
+            return self.circuit_breaker.protected_call(
+                f"test_{test_case['name']}",
+                self._run_test_implementation,
+                test_case
+            )
+        finally:
+            # Per-thread CPU time, so tests running alongside are not counted
+            measured['cpu_time'] = time.thread_time() - cpu_start
+
+    async def _run_measured_async(self, test_case: Dict, measured: Dict) -> Dict:
+        """Await an async test, recording only its own CPU time in measured"""
+        timed = _CpuTimed(self._run_test_implementation(test_case))
+        try:
+            return await timed
+        finally:
+            measured['cpu_time'] = timed.cpu_time
+
+    async def _run_test_implementation(self, test_case: Dict) -> Dict:
+        """Actual test implementation - to be overridden by specific test frameworks
+
+        Overrides should stay async and use async I/O clients (aiohttp, asyncpg)
+        for remote calls so waiting tests do not hold a slot. A plain blocking
+        override still works; it is run on a worker thread instead.
+        """
+        await asyncio.sleep(random.uniform(0.1, 2.0))
 
         if random.random() < 0.1:
             raise Exception("Simulated test failure")
@@ -141,27 +283,67 @@ class ExecutionOrchestratorAgent:
 
     def _check_dependency(self, dependency: str) -> bool:
         """Check a single dependency"""
-        if 'database' in dependency.lower():
-            return self._check_database_connection()
-        elif 'api' in dependency.lower():
-            return self._check_api_availability()
-        elif 'user' in dependency.lower():
-            return self._check_user_exists()
-        else:
+        kind = _dependency_kind(dependency)
+        if kind == 'other':
             return True
 
-    def _collect_performance_metrics(self) -> Dict:
+        now = time.monotonic()
+        with self._probe_lock:
+            cached = self._probe_results.get(kind)
+        if cached and cached[0] > now:
+            return cached[1]
+
+        try:
+            self.circuit_breaker.protected_call(
+                f"dependency_{kind}",
+                self._probe_dependency,
+                kind
+            )
+        except Exception as e:
+            # A failed probe or an open breaker both mean the test is skipped
+            logger.warning(f"Dependency {dependency} unavailable: {e}")
+            return False
+
+        # Only successes are cached; repeated failures are left to the circuit
+        # breaker, which opens and stops re-probing a dead dependency
+        with self._probe_lock:
+            self._probe_results[kind] = (now + DEPENDENCY_CHECK_TTL_SECONDS, True)
+        return True
+
+    def _probe_dependency(self, kind: str) -> bool:
+        """Run the probe for a dependency kind, raising if it reports unavailable
+
+        Raising lets the circuit breaker count an unavailable dependency as a
+        failure, not only a probe that errors.
+        """
+        if not getattr(self, self._DEPENDENCY_PROBES[kind])():
+            raise ConnectionError(f"{kind} dependency unavailable")
+        return True
+
+    def _open_dependency(self, dependencies: Iterable[str]) -> Optional[str]:
+        """First dependency whose probe circuit breaker is open, if any"""
+        for dependency in dependencies:
+            kind = _dependency_kind(dependency)
+            if kind != 'other' and self.circuit_breaker.is_open(f"dependency_{kind}"):
+                return dependency
+        return None
+
+    def _collect_performance_metrics(self, cpu_time: float = 0.0) -> Dict:
         """Collect performance metrics for the test"""
         return {
-            'memory_peak': psutil.Process().memory_info().rss / 1024 / 1024,
-            'cpu_peak': psutil.Process().cpu_percent(),
+            'memory_peak': _PROCESS.memory_info().rss / 1024 / 1024,
+            'cpu_time': cpu_time,
             'io_operations': 0
         }
 
-    def _get_stack_trace(self) -> str:
-        """Get current stack trace for error reporting"""
-        import traceback
-        return traceback.format_exc()
+    def _get_stack_trace(self, error: Exception) -> Dict:
+        """Get the error's stack trace for reporting, without formatting source lines"""
+        frames = traceback.StackSummary.extract(traceback.walk_tb(error.__traceback__), lookup_lines=False)
+        return {
+            'type': type(error).__name__,
+            'message': str(error),
+            'frames': [f"{frame.filename}:{frame.lineno} in {frame.name}" for frame in frames]
+        }
 
     @tool
     def _optimize_execution_tool(self, execution_results: Dict) -> Dict:
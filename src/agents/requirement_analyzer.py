@@ -1,15 +1,59 @@
+import re
 from crewai import Agent
 from langchain.tools import tool
-from langchain.llms import OpenAI
 from typing import List, Dict
 from ..core.config_manager import config, logger
+from . import shared_llm
+
+COMPLEXITY_KEYWORDS = ('complex', 'integrate', 'multiple', 'system', 'api', 'database')
+HIGH_PRIORITY_KEYWORDS = ('security', 'injection', 'xss', 'authentication', 'payment')
+MEDIUM_PRIORITY_KEYWORDS = ('validation', 'integration', 'performance')
+
+# One case-insensitive scan per keyword group instead of a lower() and
+# substring test per keyword
+COMPLEXITY_RE = re.compile('|'.join(map(re.escape, COMPLEXITY_KEYWORDS)), re.IGNORECASE)
+HIGH_PRIORITY_RE = re.compile('|'.join(map(re.escape, HIGH_PRIORITY_KEYWORDS)), re.IGNORECASE)
+MEDIUM_PRIORITY_RE = re.compile('|'.join(map(re.escape, MEDIUM_PRIORITY_KEYWORDS)), re.IGNORECASE)
+
+LOGIN_SCENARIOS = (
+    'Successful login with valid credentials',
+    'Failed login with invalid credentials',
+    'Login with empty credentials',
+    'Login with SQL injection payload',
+    'Login with XSS payload',
+    'Login rate limiting',
+    'Session management after login'
+)
+LOGIN_EDGE_CASES = (
+    'Very long username/password',
+    'Special characters in credentials',
+    'Concurrent login attempts',
+    'Login after session timeout'
+)
+FORM_SCENARIOS = (
+    'Form submission with valid data',
+    'Form validation with invalid data',
+    'Required field validation',
+    'Cross-site scripting prevention',
+    'SQL injection prevention',
+    'File upload validation',
+    'Form reset functionality'
+)
+
+# (test scenarios, edge cases) added when a requirement mentions the keyword,
+# applied in this order
+REQUIREMENT_TEMPLATES = {
+    'login': (LOGIN_SCENARIOS, LOGIN_EDGE_CASES),
+    'form': (FORM_SCENARIOS, ())
+}
+REQUIREMENT_KEYWORD_RE = re.compile('|'.join(map(re.escape, REQUIREMENT_TEMPLATES)), re.IGNORECASE)
 
 
 class RequirementAnalyzerAgent:
     """AI Agent for analyzing and interpreting test requirements"""
 
     def __init__(self):
-        self.llm = OpenAI(temperature=0.1)
+        self.llm = shared_llm(0.1)
         self.agent = self._create_agent()
 
     def _create_agent(self) -> Agent:
@@ -38,36 +82,15 @@ class RequirementAnalyzerAgent:
                 'complexity_score': 0
             }
 
-            complexity_keywords = ['complex', 'integrate', 'multiple', 'system', 'api', 'database']
-            analysis['complexity_score'] = sum(1 for word in complexity_keywords if word in requirement.lower())
-
-            if 'login' in requirement.lower():
-                analysis['test_scenarios'].extend([
-                    'Successful login with valid credentials',
-                    'Failed login with invalid credentials',
-                    'Login with empty credentials',
-                    'Login with SQL injection payload',
-                    'Login with XSS payload',
-                    'Login rate limiting',
-                    'Session management after login'
-                ])
-                analysis['edge_cases'].extend([
-                    'Very long username/password',
-                    'Special characters in credentials',
-                    'Concurrent login attempts',
-                    'Login after session timeout'
-                ])
-
-            if 'form' in requirement.lower():
-                analysis['test_scenarios'].extend([
-                    'Form submission with valid data',
-                    'Form validation with invalid data',
-                    'Required field validation',
-                    'Cross-site scripting prevention',
-                    'SQL injection prevention',
-                    'File upload validation',
-                    'Form reset functionality'
-                ])
+            # Score counts distinct keywords, not repeated mentions
+            analysis['complexity_score'] = len({match.lower() for match in COMPLEXITY_RE.findall(requirement)})
+
+            # One scan finds every template keyword the requirement mentions
+            matched = {keyword.lower() for keyword in REQUIREMENT_KEYWORD_RE.findall(requirement)}
+            for keyword, (scenarios, edge_cases) in REQUIREMENT_TEMPLATES.items():
+                if keyword in matched:
+                    analysis['test_scenarios'].extend(scenarios)
+                    analysis['edge_cases'].extend(edge_cases)
 
             analysis['risk_assessment'] = {
                 'high_risk': len([s for s in analysis['test_scenarios'] if 'injection' in s or 'XSS' in s]),
@@ -100,23 +123,21 @@ class RequirementAnalyzerAgent:
 
     def _determine_priority(self, scenario: str) -> str:
         """Determine test scenario priority"""
-        high_priority_keywords = ['security', 'injection', 'XSS', 'authentication', 'payment']
-        medium_priority_keywords = ['validation', 'integration', 'performance']
-
-        if any(keyword in scenario.lower() for keyword in high_priority_keywords):
+        if HIGH_PRIORITY_RE.search(scenario):
             return 'HIGH'
-        elif any(keyword in scenario.lower() for keyword in medium_priority_keywords):
+        elif MEDIUM_PRIORITY_RE.search(scenario):
             return 'MEDIUM'
         else:
             return 'LOW'
 
     def _estimate_execution_time(self, scenario: str) -> int:
         """Estimate execution time in seconds"""
-        if 'security' in scenario.lower():
+        scenario_lc = scenario.lower()
+        if 'security' in scenario_lc:
             return 120
-        elif 'performance' in scenario.lower():
+        elif 'performance' in scenario_lc:
             return 180
-        elif 'integration' in scenario.lower():
+        elif 'integration' in scenario_lc:
             return 90
         else:
             return 60
@@ -125,9 +146,10 @@ class RequirementAnalyzerAgent:
         """Identify test data requirements"""
         needs = ['valid test data', 'invalid test data']
 
-        if 'login' in scenario.lower():
+        scenario_lc = scenario.lower()
+        if 'login' in scenario_lc:
             needs.extend(['valid credentials', 'invalid credentials', 'edge case credentials'])
-        if 'form' in scenario.lower():
+        if 'form' in scenario_lc:
             needs.extend(['boundary values', 'special characters', 'max length data'])
 
         return needs
@@ -136,20 +158,22 @@ class RequirementAnalyzerAgent:
         """Identify test preconditions"""
         preconditions = ['System is available', 'Test environment is prepared']
 
-        if 'login' in scenario.lower():
+        scenario_lc = scenario.lower()
+        if 'login' in scenario_lc:
             preconditions.append('User account exists')
-        if 'database' in scenario.lower():
+        if 'database' in scenario_lc:
             preconditions.append('Database is accessible')
 
         return preconditions
 
     def _define_expected_results(self, scenario: str) -> List[str]:
         """Define expected results for test scenario"""
-        if 'successful' in scenario.lower():
+        scenario_lc = scenario.lower()
+        if 'successful' in scenario_lc:
             return ['Operation completes successfully', 'Correct response is received']
-        elif 'failed' in scenario.lower():
+        elif 'failed' in scenario_lc:
             return ['Appropriate error message is displayed', 'System handles error gracefully']
-        elif 'security' in scenario.lower():
+        elif 'security' in scenario_lc:
             return ['Security controls are effective', 'Vulnerability is prevented']
         else:
             return ['Expected behavior is observed']
\ No newline at end of file
@@ -1,16 +1,89 @@
+from functools import lru_cache
 from crewai import Agent
 from langchain.tools import tool
-from langchain.llms import OpenAI
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 from ..core.config_manager import config, logger
+from . import shared_llm
 from ..utils.edge_case_generator import EdgeCaseGenerator
 
+# Scenario names repeat heavily within a batch ("Login ...", "Form ..."), so
+# the keyword dispatch below is cached per name. Cached values are shared
+# and must be copied before use.
+SCENARIO_CACHE_SIZE = 512
+
+LOGIN_DATA_TEMPLATE = {
+    'valid_data': {'username': 'testuser', 'password': 'ValidPass123!'},
+    'invalid_data': {'username': 'invaliduser', 'password': 'wrongpassword'},
+    'edge_cases': {'username': ('strings', 3), 'password': ('strings', 3)}
+}
+
+EMAIL_DATA_TEMPLATE = {
+    'valid_data': {'email': 'test@example.com'},
+    'invalid_data': {'email': 'invalid-email'},
+    'edge_cases': {'email': ('emails', 5)}
+}
+
+
+@lru_cache(maxsize=SCENARIO_CACHE_SIZE)
+def _steps_for(scenario_name: str) -> Tuple[str, ...]:
+    """Test steps for a scenario name"""
+    scenario_lc = scenario_name.lower()
+    if 'login' in scenario_lc:
+        return (
+            "Navigate to login page",
+            "Enter credentials",
+            "Click login button",
+            "Verify login result"
+        )
+    elif 'form' in scenario_lc:
+        return (
+            "Navigate to form page",
+            "Fill form fields",
+            "Submit form",
+            "Verify submission result"
+        )
+    else:
+        return (
+            "Execute test operation",
+            "Verify expected behavior"
+        )
+
+
+@lru_cache(maxsize=SCENARIO_CACHE_SIZE)
+def _data_template_for(scenario_name: str) -> Optional[Dict]:
+    """Test data template for a scenario name, or None when it needs no data"""
+    scenario_lc = scenario_name.lower()
+    if 'login' in scenario_lc:
+        return LOGIN_DATA_TEMPLATE
+    elif 'email' in scenario_lc:
+        return EMAIL_DATA_TEMPLATE
+    return None
+
+
+@lru_cache(maxsize=SCENARIO_CACHE_SIZE)
+def _tags_for(scenario_name: str) -> Tuple[str, ...]:
+    """Organization tags for a scenario name"""
+    tags = []
+
+    scenario_lc = scenario_name.lower()
+    if 'security' in scenario_lc:
+        tags.extend(['security', 'owasp', 'penetration-test'])
+    if 'performance' in scenario_lc:
+        tags.extend(['performance', 'load', 'stress'])
+    if 'login' in scenario_lc:
+        tags.extend(['authentication', 'authn'])
+    if 'api' in scenario_lc:
+        tags.extend(['api', 'rest', 'integration'])
+
+    tags.append(scenario_lc.split()[0])
+    return tuple(tags)
+
 
 class TestGeneratorAgent:
     """AI Agent for generating comprehensive test cases"""
 
     def __init__(self):
-        self.llm = OpenAI(temperature=0.3)
+        self.llm = shared_llm(0.3)
         self.edge_case_generator = EdgeCaseGenerator()
         self.agent = self._create_agent()
 
@@ -45,35 +118,16 @@ class TestGeneratorAgent:
                 'dependencies': scenario.get('preconditions', []),
                 'timeout': scenario.get('estimated_time', 60)
             }
+            # Sizes read by _calculate_execution_priority, known here for free
+            test_case['_step_count'] = len(test_case['steps'])
+            test_case['_data_size'] = sum(len(data) for data in test_case['test_data'].values())
             test_cases.append(test_case)
 
         return test_cases
 
     def _generate_test_steps(self, scenario_name: str) -> List[str]:
         """Generate test steps based on scenario"""
-        steps = []
-
-        if 'login' in scenario_name.lower():
-            steps = [
-                "Navigate to login page",
-                "Enter credentials",
-                "Click login button",
-                "Verify login result"
-            ]
-        elif 'form' in scenario_name.lower():
-            steps = [
-                "Navigate to form page",
-                "Fill form fields",
-                "Submit form",
-                "Verify submission result"
-            ]
-        else:
-            steps = [
-                "Execute test operation",
-                "Verify expected behavior"
-            ]
-
-        return steps
+        return list(_steps_for(scenario_name))
 
     def _generate_test_data(self, scenario_name: str) -> Dict:
         """Generate test data for scenario"""
@@ -83,44 +137,20 @@ class TestGeneratorAgent:
             'edge_case_data': {}
         }
 
-        if 'login' in scenario_name.lower():
-            test_data['valid_data'] = {
-                'username': 'testuser',
-                'password': 'ValidPass123!'
-            }
-            test_data['invalid_data'] = {
-                'username': 'invaliduser',
-                'password': 'wrongpassword'
-            }
-            test_data['edge_case_data'] = {
-                'username': self.edge_case_generator.generate_edge_cases('strings', 3),
-                'password': self.edge_case_generator.generate_edge_cases('strings', 3)
-            }
-
-        elif 'email' in scenario_name.lower():
-            test_data['valid_data'] = {'email': 'test@example.com'}
-            test_data['invalid_data'] = {'email': 'invalid-email'}
+        template = _data_template_for(scenario_name)
+        if template:
+            test_data['valid_data'] = dict(template['valid_data'])
+            test_data['invalid_data'] = dict(template['invalid_data'])
             test_data['edge_case_data'] = {
-                'email': self.edge_case_generator.generate_edge_cases('emails', 5)
+                field: self.edge_case_generator.generate_edge_cases(field_type, count)
+                for field, (field_type, count) in template['edge_cases'].items()
             }
 
         return test_data
 
     def _generate_tags(self, scenario_name: str) -> List[str]:
         """Generate tags for test organization"""
-        tags = []
-
-        if 'security' in scenario_name.lower():
-            tags.extend(['security', 'owasp', 'penetration-test'])
-        if 'performance' in scenario_name.lower():
-            tags.extend(['performance', 'load', 'stress'])
-        if 'login' in scenario_name.lower():
-            tags.extend(['authentication', 'authn'])
-        if 'api' in scenario_name.lower():
-            tags.extend(['api', 'rest', 'integration'])
-
-        tags.append(scenario_name.split()[0].lower())
-        return tags
+        return list(_tags_for(scenario_name))
 
     @tool
     def _optimize_test_cases_tool(self, test_cases: List[Dict]) -> List[Dict]:
@@ -162,17 +192,21 @@ class TestGeneratorAgent:
 
     def _optimize_edge_cases(self, edge_cases: Dict) -> Dict:
         """Optimize edge cases to avoid test explosion"""
-        optimized = {}
-        for field, cases in edge_cases.items():
-            optimized[field] = cases[:5]
-        return optimized
+        return {field: cases[:5] for field, cases in edge_cases.items()}
 
     def _calculate_execution_priority(self, test_case: Dict) -> int:
         """Calculate execution priority based on multiple factors"""
         priority_map = {'HIGH': 3, 'MEDIUM': 2, 'LOW': 1}
         base_priority = priority_map.get(test_case.get('priority', 'MEDIUM'), 2)
 
-        complexity_factors = len(test_case.get('steps', [])) * 0.1
-        data_factors = sum(len(data) for data in test_case.get('test_data', {}).values()) * 0.05
+        step_count = test_case.get('_step_count')
+        if step_count is None:
+            step_count = len(test_case.get('steps', []))
+        data_size = test_case.get('_data_size')
+        if data_size is None:
+            data_size = sum(len(data) for data in test_case.get('test_data', {}).values())
+
+        complexity_factors = step_count * 0.1
+        data_factors = data_size * 0.05
 
         return min(10, max(1, int(base_priority + complexity_factors + data_factors)))
\ No newline at end of file
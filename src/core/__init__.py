@@ -1,8 +1,21 @@
 """Core module for the AI test case generation system."""
 
-from .test_case_generator import TestCaseGenerator
-from .jira_client import JIRAClient
-from .test_case_analyzer import TestCaseAnalyzer
-from .playwright_generator import PlaywrightTestGenerator
+import importlib
+
+# Exported names and the submodules defining them. They are imported on first
+# access so that using one (e.g. the JIRA client) doesn't load them all.
+_EXPORTS = {
+    'TestCaseGenerator': '.test_case_generator',
+    'JIRAClient': '.jira_client',
+    'TestCaseAnalyzer': '.test_case_analyzer',
+    'PlaywrightTestGenerator': '.playwright_generator'
+}
 
 __all__ = ['TestCaseGenerator', 'JIRAClient', 'TestCaseAnalyzer', 'PlaywrightTestGenerator']
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -1,28 +1,142 @@
 """Module for processing JIRA ticket attachments."""
+import hashlib
+import io
+import mmap
 import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 import logging
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import mimetypes
 import requests
+from requests.adapters import HTTPAdapter
 from PIL import Image
 import pytesseract
 import fitz  # PyMuPDF
 import json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
 logger = logging.getLogger(__name__)
 
+# Characters of PDF text kept per document; extraction stops past this
+PDF_TEXT_MAX_CHARS = 10_000_000
+
+# Plain-text extraction that still clips to the page but skips the default
+# ligature and whitespace preservation, which only add post-processing
+PDF_TEXT_FLAGS = fitz.TEXT_MEDIABOX_CLIP
+
+# Attachments downloaded at once, and downloaded files parsed or OCR'd at once
+DOWNLOAD_WORKERS = 16
+PROCESS_WORKERS = 4
+
+# JSON test data larger than this is parsed straight from a memory map
+TEST_DATA_MMAP_THRESHOLD = 8 * 1024 * 1024
+
+# Result category and handler method per MIME type; images match by prefix
+_MIME_DISPATCH = {
+    'application/pdf': ('documents', 'process_pdf'),
+    'application/json': ('test_data', 'process_test_data'),
+    'text/plain': ('test_data', 'process_test_data')
+}
+
+# Categories whose extraction (OCR, PDF parsing) is worth caching by file content
+CACHED_CATEGORIES = ('images', 'documents')
+
+# Extraction results kept in memory, shared by every processor in the process
+EXTRACTION_CACHE_MAX_SIZE = 256
+
+# Part of every extraction cache key, with the OCR and PDF settings below;
+# bump it when the extraction pipeline changes so stored results are redone
+EXTRACTION_CACHE_VERSION = 1
+
+_extraction_cache = OrderedDict()
+_extraction_cache_lock = threading.Lock()
+
+# Load the MIME database at import rather than on first use, which may now
+# happen on several processing threads at once
+mimetypes.init()
+
+# Bytes read from the response and written to disk per chunk
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# (connect, read) timeouts for attachment downloads, in seconds
+DOWNLOAD_TIMEOUT = (5, 30)
+
+# Shared by all download threads so connections to the JIRA host are kept alive
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(pool_connections=16, pool_maxsize=32))
+_SESSION.mount('http://', HTTPAdapter(pool_connections=16, pool_maxsize=32))
+
+# Longest image edge handed to OCR; cost grows with pixel count and
+# screenshots are often 4K
+OCR_MAX_EDGE = 1600
+
+# One resident Tesseract engine per thread when tesserocr is installed;
+# an engine is not safe to share between threads
+_ocr_engines = threading.local()
+
+def _ocr_text(image: Image.Image) -> str:
+    """Run OCR on an image, reusing this thread's engine when possible"""
+    if tesserocr is None:
+        return pytesseract.image_to_string(image)
+        
+    api = getattr(_ocr_engines, 'api', None)
+    if api is None:
+        api = _ocr_engines.api = tesserocr.PyTessBaseAPI(lang='eng')
+    api.SetImage(image)
+    return api.GetUTF8Text()
+
+def _file_digest(file_path: Path) -> str:
+    """BLAKE2b digest of a file's content, read in chunks"""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _extraction_cache_key(handler: str, file_path: Path) -> str:
+    """Cache key for a handler's result on a file's content and current settings"""
+    settings = repr((EXTRACTION_CACHE_VERSION, OCR_MAX_EDGE, PDF_TEXT_FLAGS, PDF_TEXT_MAX_CHARS))
+    settings_tag = hashlib.blake2b(settings.encode('utf-8'), digest_size=4).hexdigest()
+    return f"{handler}-{settings_tag}-{_file_digest(file_path)}"
+
+def _load_json(file_path: Path):
+    """Parse a JSON file from its raw bytes, without decoding it to str first"""
+    if orjson is None:
+        return json.loads(file_path.read_bytes())
+        
+    if file_path.stat().st_size <= TEST_DATA_MMAP_THRESHOLD:
+        return orjson.loads(file_path.read_bytes())
+        
+    with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        with memoryview(mapped) as view:
+            return orjson.loads(view)
+
 class AttachmentProcessor:
     """Processes JIRA ticket attachments for enhanced test case generation."""
     
-    def __init__(self, output_dir: str):
+    def __init__(self, output_dir: str, cache_dir: Optional[str] = None):
         """Initialize attachment processor.
         
         Args:
             output_dir: Directory to store downloaded attachments
+            cache_dir: Directory persisting OCR and PDF results by file content,
+                shared between tickets; None keeps them in memory only
         """
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.cache_dir = Path(cache_dir) if cache_dir else None
         
     def process_attachments(self, attachments: List[Dict]) -> Dict[str, List[Dict]]:
         """Process all attachments from a JIRA ticket.
@@ -40,42 +154,131 @@ class AttachmentProcessor:
             'other': []
         }
         
-        for attachment in attachments:
-            try:
-                file_path = self.download_attachment(attachment)
-                if not file_path:
+        if not attachments:
+            return processed_data
+            
+        # Each file is handed to the processing pool as soon as its download
+        # finishes, so OCR and PDF parsing overlap the remaining downloads
+        processing = [None] * len(attachments)
+        with ThreadPoolExecutor(max_workers=min(DOWNLOAD_WORKERS, len(attachments))) as download_pool, \
+             ThreadPoolExecutor(max_workers=min(PROCESS_WORKERS, len(attachments))) as process_pool:
+            downloads = {
+                download_pool.submit(self.download_attachment, attachment): index
+                for index, attachment in enumerate(attachments)
+            }
+            for future in as_completed(downloads):
+                index = downloads[future]
+                try:
+                    file_path = future.result()
+                except Exception as e:
+                    logger.error(f"Error processing attachment {attachments[index]['filename']}: {str(e)}")
                     continue
                     
-                mime_type = mimetypes.guess_type(file_path)[0]
-                
-                if mime_type:
-                    if mime_type.startswith('image/'):
-                        image_data = self.process_image(file_path)
-                        if image_data:
-                            processed_data['images'].append(image_data)
-                            
-                    elif mime_type == 'application/pdf':
-                        pdf_data = self.process_pdf(file_path)
-                        if pdf_data:
-                            processed_data['documents'].append(pdf_data)
-                            
-                    elif mime_type in ['application/json', 'text/plain']:
-                        test_data = self.process_test_data(file_path)
-                        if test_data:
-                            processed_data['test_data'].append(test_data)
-                            
-                    else:
-                        processed_data['other'].append({
-                            'filename': attachment['filename'],
-                            'mime_type': mime_type
-                        })
-                        
+                if file_path:
+                    processing[index] = process_pool.submit(
+                        self._process_file, attachments[index], file_path
+                    )
+                    
+        # Collect in attachment order so each category list is deterministic
+        for attachment, future in zip(attachments, processing):
+            if future is None:
+                continue
+            try:
+                result = future.result()
             except Exception as e:
                 logger.error(f"Error processing attachment {attachment['filename']}: {str(e)}")
                 continue
                 
+            if result:
+                category, data = result
+                processed_data[category].append(data)
+                
         return processed_data
         
+    def _process_file(self, attachment: Dict, file_path: Path) -> Optional[Tuple[str, Dict]]:
+        """Process one downloaded attachment according to its MIME type.
+        
+        Args:
+            attachment: Attachment metadata from JIRA
+            file_path: Path to the downloaded file
+            
+        Returns:
+            Tuple of (category, processed data) or None if nothing was extracted
+        """
+        mime_type = mimetypes.guess_type(file_path)[0]
+        
+        if not mime_type:
+            return None
+            
+        dispatch = _MIME_DISPATCH.get(mime_type)
+        if dispatch is None and mime_type.startswith('image/'):
+            dispatch = ('images', 'process_image')
+            
+        if dispatch is None:
+            return ('other', {
+                'filename': attachment['filename'],
+                'mime_type': mime_type
+            })
+            
+        category, handler = dispatch
+        if category not in CACHED_CATEGORIES:
+            data = getattr(self, handler)(file_path)
+            return (category, data) if data else None
+            
+        # The same screenshot or PDF is often attached to many tickets; reuse
+        # the extraction for identical content under this attachment's name
+        cache_key = _extraction_cache_key(handler, file_path)
+        data = self._get_cached_extraction(cache_key)
+        if data is not None:
+            return (category, dict(data, filename=file_path.name))
+            
+        data = getattr(self, handler)(file_path)
+        if data:
+            self._cache_extraction(cache_key, data)
+        return (category, data) if data else None
+        
+    def _get_cached_extraction(self, cache_key: str) -> Optional[Dict]:
+        """Return a stored extraction result from memory or disk, if any."""
+        with _extraction_cache_lock:
+            data = _extraction_cache.get(cache_key)
+            if data is not None:
+                _extraction_cache.move_to_end(cache_key)
+                return data
+                
+        if self.cache_dir is None:
+            return None
+            
+        try:
+            data = json.loads((self.cache_dir / f"{cache_key}.json").read_bytes())
+        except (OSError, ValueError):
+            return None
+            
+        self._remember_extraction(cache_key, data)
+        return data
+        
+    def _cache_extraction(self, cache_key: str, data: Dict) -> None:
+        """Store an extraction result in memory and, if configured, on disk."""
+        self._remember_extraction(cache_key, data)
+        if self.cache_dir is None:
+            return
+            
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            cache_file = self.cache_dir / f"{cache_key}.json"
+            tmp_file = cache_file.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_file.write_text(json.dumps(data))
+            os.replace(tmp_file, cache_file)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Could not cache extraction for {data.get('filename')}: {str(e)}")
+            
+    def _remember_extraction(self, cache_key: str, data: Dict) -> None:
+        """Keep an extraction result in the shared in-memory LRU."""
+        with _extraction_cache_lock:
+            _extraction_cache[cache_key] = data
+            _extraction_cache.move_to_end(cache_key)
+            while len(_extraction_cache) > EXTRACTION_CACHE_MAX_SIZE:
+                _extraction_cache.popitem(last=False)
+        
     def download_attachment(self, attachment: Dict) -> Optional[Path]:
         """Download attachment from JIRA.
         
@@ -98,16 +301,28 @@ class AttachmentProcessor:
             # Create Basic Auth header
             auth = (jira_email, jira_token)
             
-            # Download using requests with Basic Auth
-            response = requests.get(
+            # Download using requests with Basic Auth, streaming the body to a
+            # temporary file so a failed transfer never leaves a partial attachment
+            part_path = file_path.with_name(file_path.name + '.part')
+            with _SESSION.get(
                 attachment['content'],
                 auth=auth,
-                verify=True
-            )
-            response.raise_for_status()
-            
-            # Save file
-            file_path.write_bytes(response.content)
+                verify=True,
+                stream=True,
+                timeout=DOWNLOAD_TIMEOUT
+            ) as response:
+                response.raise_for_status()
+                
+                # Save file
+                try:
+                    with open(part_path, 'wb') as f:
+                        for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                            f.write(chunk)
+                    os.replace(part_path, file_path)
+                except BaseException:
+                    part_path.unlink(missing_ok=True)
+                    raise
+                    
             return file_path
             
         except Exception as e:
@@ -125,16 +340,31 @@ class AttachmentProcessor:
         """
         try:
             with Image.open(file_path) as img:
-                # Extract text using OCR
-                text = pytesseract.image_to_string(img)
+                # A list, as a result read back from the disk cache has it
+                dimensions = list(img.size)
+                image_format = img.format
                 
-                return {
-                    'filename': file_path.name,
-                    'dimensions': img.size,
-                    'format': img.format,
-                    'extracted_text': text.strip(),
-                    'type': 'screenshot' if 'screenshot' in file_path.name.lower() else 'image'
-                }
+                # Let the JPEG decoder scale down and drop colour while decoding
+                # (DCT scaling), so large photos are never decoded at full size;
+                # other formats ignore this
+                img.draft('L', (OCR_MAX_EDGE, OCR_MAX_EDGE))
+                
+                # OCR a grayscale copy no larger than OCR_MAX_EDGE; colour
+                # and resolution beyond that only slow Tesseract down
+                ocr_image = img.convert('L')
+                if max(ocr_image.size) > OCR_MAX_EDGE:
+                    ocr_image.thumbnail((OCR_MAX_EDGE, OCR_MAX_EDGE), Image.LANCZOS)
+                    
+            # Extract text using OCR
+            text = _ocr_text(ocr_image)
+            
+            return {
+                'filename': file_path.name,
+                'dimensions': dimensions,
+                'format': image_format,
+                'extracted_text': text.strip(),
+                'type': 'screenshot' if 'screenshot' in file_path.name.lower() else 'image'
+            }
                 
         except Exception as e:
             logger.error(f"Error processing image {file_path}: {str(e)}")
@@ -150,18 +380,33 @@ class AttachmentProcessor:
             Dict containing PDF content or None if failed
         """
         try:
-            pdf_document = fitz.open(file_path)
-            text_content = []
+            # Pages are written out and dropped one at a time, so neither a
+            # list of page texts nor its joined copy is ever held
+            content = io.StringIO()
+            truncated = False
             
-            for page_num in range(len(pdf_document)):
-                page = pdf_document[page_num]
-                text_content.append(page.get_text())
-                
-            return {
+            with fitz.open(file_path) as pdf_document:
+                page_count = len(pdf_document)
+                for page_num, page in enumerate(pdf_document):
+                    if page_num:
+                        content.write('\n')
+                    content.write(page.get_text("text", flags=PDF_TEXT_FLAGS))
+                    del page
+                    
+                    if content.tell() > PDF_TEXT_MAX_CHARS:
+                        logger.warning(f"Stopped reading {file_path.name} after {page_num + 1} of "
+                                       f"{page_count} pages: text exceeds {PDF_TEXT_MAX_CHARS} characters")
+                        truncated = True
+                        break
+                        
+            result = {
                 'filename': file_path.name,
-                'pages': len(pdf_document),
-                'content': '\n'.join(text_content)
+                'pages': page_count,
+                'content': content.getvalue()
             }
+            if truncated:
+                result['truncated'] = True
+            return result
             
         except Exception as e:
             logger.error(f"Error processing PDF {file_path}: {str(e)}")
@@ -177,11 +422,9 @@ class AttachmentProcessor:
             Dict containing parsed data or None if failed
         """
         try:
-            content = file_path.read_text()
-            
-            # Try parsing as JSON
+            # Try parsing as JSON; orjson.JSONDecodeError subclasses json's
             try:
-                data = json.loads(content)
+                data = _load_json(file_path)
                 return {
                     'filename': file_path.name,
                     'type': 'json',
@@ -192,7 +435,7 @@ class AttachmentProcessor:
                 return {
                     'filename': file_path.name,
                     'type': 'text',
-                    'content': content
+                    'content': file_path.read_text()
                 }
                 
         except Exception as e:
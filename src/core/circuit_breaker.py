@@ -1,32 +1,87 @@
-from collections import defaultdict
-from datetime import datetime
-from typing import Any, Callable
+import time
+from typing import Any, Callable, Dict
 from .config_manager import logger
 
 
+class _CircuitState:
+    """Failure bookkeeping for one protected name"""
+
+    __slots__ = ('failure_count', 'last_failure_time')
+
+    def __init__(self):
+        self.failure_count = 0
+        # time.monotonic_ns() of the latest failure
+        self.last_failure_time = None
+
+
 class CircuitBreakerManager:
     """Advanced circuit breaker for fault tolerance"""
 
     def __init__(self):
         self.circuit_breakers = {}
-        self.failure_counts = defaultdict(int)
-        self.last_failure_time = defaultdict(lambda: None)
+        # One entry per name, so a protected call does a single dict lookup
+        self._states: Dict[str, _CircuitState] = {}
         self.recovery_timeout = 60
 
+    @property
+    def recovery_timeout(self) -> float:
+        """Seconds a circuit stays open after its latest failure"""
+        return self._recovery_timeout_ns / 1_000_000_000
+
+    @recovery_timeout.setter
+    def recovery_timeout(self, seconds: float):
+        # Kept in integer nanoseconds to match the failure timestamps
+        self._recovery_timeout_ns = int(seconds * 1_000_000_000)
+
+    def _state(self, func_name: str) -> _CircuitState:
+        """Bookkeeping for func_name, created on first use"""
+        state = self._states.get(func_name)
+        if state is None:
+            state = self._states.setdefault(func_name, _CircuitState())
+        return state
+
+    def _rejects(self, state: _CircuitState) -> bool:
+        """Whether a circuit in this state is open"""
+        return (state.failure_count >= 5 and
+                time.monotonic_ns() - state.last_failure_time < self._recovery_timeout_ns)
+
+    def is_open(self, func_name: str) -> bool:
+        """Whether calls to func_name are currently being rejected"""
+        state = self._states.get(func_name)
+        return state is not None and self._rejects(state)
+
     def protected_call(self, func_name: str, func: Callable, *args, **kwargs) -> Any:
         """Execute function with circuit breaker protection"""
-        try:
-            # Check if circuit is open
-            if (self.last_failure_time[func_name] and
-                (datetime.now() - self.last_failure_time[func_name]).total_seconds() < self.recovery_timeout and
-                self.failure_counts[func_name] >= 5):
-                raise Exception(f"Circuit breaker open for {func_name}")
+        state = self._state(func_name)
+        # Check if circuit is open; a rejected call is not itself a failure
+        if self._rejects(state):
+            raise Exception(f"Circuit breaker open for {func_name}")
 
+        try:
             result = func(*args, **kwargs)
-            self.failure_counts[func_name] = 0
-            return result
         except Exception as e:
-            self.failure_counts[func_name] += 1
-            self.last_failure_time[func_name] = datetime.now()
-            logger.error(f"Circuit breaker triggered for {func_name}: {e}")
-            raise
\ No newline at end of file
+            state.failure_count += 1
+            state.last_failure_time = time.monotonic_ns()
+            logger.error("Circuit breaker triggered for %s: %s", func_name, e)
+            raise
+
+        state.failure_count = 0
+        return result
+
+    async def protected_call_async(self, func_name: str, func: Callable, *args, **kwargs) -> Any:
+        """Await a coroutine function with circuit breaker protection"""
+        state = self._state(func_name)
+        # Check if circuit is open; a rejected call is not itself a failure
+        if self._rejects(state):
+            raise Exception(f"Circuit breaker open for {func_name}")
+
+        try:
+            result = await func(*args, **kwargs)
+        except Exception as e:
+            state.failure_count += 1
+            state.last_failure_time = time.monotonic_ns()
+            logger.error("Circuit breaker triggered for %s: %s", func_name, e)
+            raise
+
+        state.failure_count = 0
+        return result
@@ -1,4 +1,6 @@
 import os
+import json
+import re
 import threading
 import yaml
 import logging
@@ -7,6 +9,64 @@ from typing import Any, Dict, Optional
 from dataclasses import dataclass
 from enum import Enum
 
+# libyaml's C parser and emitter when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as YamlLoader, CSafeDumper as YamlDumper
+except ImportError:
+    from yaml import SafeLoader as YamlLoader, SafeDumper as YamlDumper
+
+# Sidecar holding the parsed config file as JSON, reused while the YAML file's
+# mtime and size are unchanged
+CONFIG_CACHE_SUFFIX = '.cache.json'
+
+# Scenario keyword lists matched against page text, and the key under which
+# each scenario also gets one compiled case-insensitive pattern for the list
+INDICATOR_FIELDS = {
+    'success_indicators': '_success_re',
+    'failure_indicators': '_failure_re'
+}
+
+
+def _freeze_strings(values: Any, lowercase: bool = False) -> Any:
+    """Interned tuple for a list of strings; anything else unchanged"""
+    if not isinstance(values, list) or not all(isinstance(v, str) for v in values):
+        return values
+    return tuple(sys.intern(v.lower() if lowercase else v) for v in values)
+
+
+def _freeze_scenarios(config: dict) -> dict:
+    """Copy of config whose test_scenarios selector and keyword lists are frozen"""
+    scenarios = config.get('test_scenarios')
+    if not isinstance(scenarios, dict):
+        return config
+
+    frozen = {}
+    for name, scenario in scenarios.items():
+        if isinstance(scenario, dict):
+            scenario = {field: _freeze_strings(values, field in INDICATOR_FIELDS)
+                        for field, values in scenario.items()}
+            for field, pattern_key in INDICATOR_FIELDS.items():
+                indicators = scenario.get(field)
+                if isinstance(indicators, tuple) and any(indicators):
+                    # One regex scan of the page text instead of an `in` test per indicator
+                    scenario[pattern_key] = re.compile(
+                        '|'.join(re.escape(indicator) for indicator in indicators if indicator),
+                        re.IGNORECASE
+                    )
+        frozen[name] = scenario
+    return {**config, 'test_scenarios': frozen}
+
+
+def _flatten(config: dict, prefix: str = ''):
+    """Yield (dotted key, value) for every nested entry, sections included"""
+    for k, value in config.items():
+        if not isinstance(k, str):
+            continue
+        key = prefix + k
+        yield key, value
+        if isinstance(value, dict):
+            yield from _flatten(value, key + '.')
+
 
 class TestStatus(Enum):
     PENDING = "pending"
@@ -59,7 +119,8 @@ class UltimateConfigManager:
     def __init__(self, config_file: str = "config/ultimate_test_config.yaml"):
         self.config_file = config_file
         self.config_lock = threading.RLock()
-        self.config_cache = {}
+        self.config = {}
+        self._publish_config()
         self.watchers = []
         self.setup_logging()
         self.load_config()
@@ -72,7 +133,8 @@ class UltimateConfigManager:
             level=logging.INFO,
             format=log_format,
             handlers=[
-                logging.FileHandler('test_automation.log'),
+                # Log file is opened on the first record, not at import
+                logging.FileHandler('test_automation.log', delay=True),
                 logging.StreamHandler(sys.stdout)
             ]
         )
@@ -159,11 +221,14 @@ class UltimateConfigManager:
             }
         }
 
+        if not yaml.__with_libyaml__:
+            self.logger.warning("PyYAML is running without libyaml; install it with libyaml "
+                                "support for faster config loading")
+
         with self.config_lock:
             if os.path.exists(self.config_file):
                 try:
-                    with open(self.config_file, 'r') as f:
-                        loaded_config = yaml.safe_load(f)
+                    loaded_config = self._read_config_file()
                     self.config = self._merge_configs(default_config, loaded_config)
                     self._validate_config()
                 except Exception as e:
@@ -174,13 +239,58 @@ class UltimateConfigManager:
                 self.config = default_config
                 self.save_config()
 
+            self._publish_config()
+
+    def _publish_config(self):
+        """Make self.config visible to get() as a flat dotted-key table"""
+        # Swapping in a table built from this config is a single attribute
+        # write, so get() needs no lock and never mixes two configs. Scenario
+        # lists are frozen only here: self.config keeps plain lists so it can
+        # still be saved as YAML
+        self._flat = dict(_flatten(_freeze_scenarios(self.config)))
+
+    def _read_config_file(self) -> Any:
+        """Parse the YAML config file, reusing its JSON sidecar while it is unchanged"""
+        stat = os.stat(self.config_file)
+        try:
+            with open(self.config_file + CONFIG_CACHE_SUFFIX, 'r') as f:
+                cached = json.load(f)
+            if cached['mtime_ns'] == stat.st_mtime_ns and cached['size'] == stat.st_size:
+                return cached['config']
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+        with open(self.config_file, 'r') as f:
+            loaded_config = yaml.load(f, Loader=YamlLoader)
+        self._write_config_cache(loaded_config, stat)
+        return loaded_config
+
+    def _write_config_cache(self, parsed: Any, stat: os.stat_result):
+        """Store a parsed config file next to it, keyed by the file's mtime and size"""
+        cache_file = self.config_file + CONFIG_CACHE_SUFFIX
+        try:
+            payload = json.dumps({'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'config': parsed})
+            # Skip configs JSON cannot represent exactly (dates, non-string keys)
+            if json.loads(payload)['config'] != parsed:
+                return
+            tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+            with open(tmp_file, 'w') as f:
+                f.write(payload)
+            os.replace(tmp_file, cache_file)
+        except (OSError, TypeError, ValueError) as e:
+            self.logger.debug(f"Could not cache parsed config: {e}")
+
     def _merge_configs(self, default: dict, loaded: dict) -> dict:
         """Deep merge configuration dictionaries"""
-        for key, value in loaded.items():
-            if key in default and isinstance(default[key], dict) and isinstance(value, dict):
-                default[key] = self._merge_configs(default[key], value)
-            else:
-                default[key] = value
+        # Nested sections are merged off an explicit stack rather than by recursion
+        stack = [(default, loaded)]
+        while stack:
+            target, source = stack.pop()
+            for key, value in source.items():
+                if isinstance(value, dict) and isinstance(target.get(key), dict):
+                    stack.append((target[key], value))
+                else:
+                    target[key] = value
         return default
 
     def _validate_config(self):
@@ -193,21 +303,7 @@ class UltimateConfigManager:
 
     def get(self, key: str, default: Any = None) -> Any:
         """Thread-safe configuration getter with caching"""
-        with self.config_lock:
-            if key in self.config_cache:
-                return self.config_cache[key]
-
-            keys = key.split('.')
-            value = self.config
-            for k in keys:
-                if isinstance(value, dict) and k in value:
-                    value = value[k]
-                else:
-                    value = default
-                    break
-
-            self.config_cache[key] = value
-            return value
+        return self._flat.get(key, default)
 
     def save_config(self):
         """Thread-safe configuration saver"""
@@ -215,8 +311,9 @@ class UltimateConfigManager:
             try:
                 os.makedirs(os.path.dirname(self.config_file), exist_ok=True)
                 with open(self.config_file, 'w') as f:
-                    yaml.dump(self.config, f, default_flow_style=False, indent=2)
-                self.config_cache.clear()
+                    yaml.dump(self.config, f, Dumper=YamlDumper, default_flow_style=False, indent=2)
+                self._write_config_cache(self.config, os.stat(self.config_file))
+                self._publish_config()
             except Exception as e:
                 self.logger.error(f"Error saving config: {e}")
 
@@ -1,11 +1,21 @@
 """JIRA API integration module"""
+import functools
 import os
-from typing import Dict, Optional
+import threading
+import time
+from typing import Dict, List, Optional
 from jira import JIRA
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import logging
 import json
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -13,10 +23,96 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Keep-alive connections held open to the JIRA server, enough for batch workers
+JIRA_POOL_SIZE = 16
+
+# Transport-level retries for transient JIRA failures, mirroring the
+# retry_policy in config/ultimate_test_config.yaml
+JIRA_RETRY = Retry(
+    total=5,
+    backoff_factor=2.0,
+    status_forcelist=[429, 500, 502, 503, 504],
+    raise_on_status=False
+)
+
+# Starting pace for JIRA calls, refined from the server's x-ratelimit headers
+JIRA_REQUESTS_PER_SECOND = float(os.getenv('JIRA_REQUESTS_PER_SECOND', '1'))
+JIRA_RATE_BURST = 10
+
+# Issue keys looked up per JQL search when fetching tickets in bulk
+JIRA_SEARCH_BATCH_SIZE = 500
+
+# Issues returned per page by a raw JQL search
+JIRA_SEARCH_PAGE_SIZE = 100
+
+# Used when no field on the server is named "Acceptance Criteria"
+DEFAULT_ACCEPTANCE_CRITERIA_FIELD = 'customfield_10029'
+
+class TokenBucket:
+    """Token bucket pacing calls from every thread against one server quota"""
+    
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+        
+    def acquire(self):
+        """Block until a token is available and take it"""
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if now >= self._paused_until and self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = max(self._paused_until - now, (1 - self._tokens) / self.rate)
+            time.sleep(wait)
+            
+    def observe(self, headers):
+        """Adopt the fill rate the server advertises and honour Retry-After"""
+        fill_rate = headers.get('x-ratelimit-fillrate')
+        interval = headers.get('x-ratelimit-interval-seconds')
+        retry_after = headers.get('retry-after')
+        with self._lock:
+            try:
+                if fill_rate and interval and float(interval) > 0:
+                    self.rate = float(fill_rate) / float(interval)
+            except ValueError:
+                pass
+            try:
+                if retry_after:
+                    self._paused_until = max(self._paused_until, time.monotonic() + float(retry_after))
+            except ValueError:
+                pass
+
+class RateLimitedAdapter(HTTPAdapter):
+    """HTTPAdapter that takes a token before every request it sends"""
+    
+    def __init__(self, limiter: TokenBucket, **kwargs):
+        self.limiter = limiter
+        super().__init__(**kwargs)
+        
+    def send(self, request, **kwargs):
+        self.limiter.acquire()
+        response = super().send(request, **kwargs)
+        self.limiter.observe(response.headers)
+        return response
+
+# Shared by every JIRAClient, since JIRA enforces the quota per account
+jira_rate_limiter = TokenBucket(JIRA_REQUESTS_PER_SECOND, JIRA_RATE_BURST)
+
 class JIRAClient:
     """Handles JIRA API interactions"""
     
-    def __init__(self):
+    def __init__(self, jira_config: Optional[Dict] = None):
+        # Explicit 'email', 'api_token' and 'server' values, else the environment
+        self.jira_config = jira_config or {}
         self.jira = None
         self.validator = None
         self._connect()
@@ -27,9 +123,9 @@ class JIRAClient:
             logger.info("Starting JIRA connection setup...")
             
             # Get credentials from environment variables
-            jira_email = os.getenv('JIRA_EMAIL')
-            jira_api_token = os.getenv('JIRA_API_TOKEN')
-            jira_server = os.getenv('JIRA_SERVER')
+            jira_email = self.jira_config.get('email') or os.getenv('JIRA_EMAIL')
+            jira_api_token = self.jira_config.get('api_token') or os.getenv('JIRA_API_TOKEN')
+            jira_server = self.jira_config.get('server') or os.getenv('JIRA_SERVER')
             
             logger.info("Loading JIRA credentials:")
             logger.info(f"JIRA_EMAIL: {'*' * len(jira_email) if jira_email else 'Not found'}")
@@ -54,11 +150,13 @@ class JIRAClient:
             
             logger.info("Attempting JIRA connection...")
             
-            # Create JIRA client
+            # Create JIRA client; retries are left to the pooled adapter below
             self.jira = JIRA(
                 options=jira_options,
-                basic_auth=(jira_email, jira_api_token)
+                basic_auth=(jira_email, jira_api_token),
+                max_retries=0
             )
+            self._configure_session()
             
             logger.info("JIRA connection successful, initializing validator...")
             
@@ -75,93 +173,211 @@ class JIRAClient:
             logger.error(f"Failed to connect to JIRA: {str(e)}", exc_info=True)
             raise
             
-    def get_issue_details(self, issue_key: str) -> Optional[Dict]:
+    def _configure_session(self):
+        """Mount a pooled, retrying, rate-limited adapter shared by every call"""
+        session = getattr(self.jira, '_session', None)
+        if session is None:
+            return
+        adapter = RateLimitedAdapter(
+            jira_rate_limiter,
+            pool_connections=JIRA_POOL_SIZE,
+            pool_maxsize=JIRA_POOL_SIZE,
+            max_retries=JIRA_RETRY
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers['Connection'] = 'keep-alive'
+            
+    @functools.cached_property
+    def acceptance_criteria_field(self) -> str:
+        """ID of the custom field holding acceptance criteria, looked up once"""
+        try:
+            for field in self.jira.fields():
+                if field.get('name', '').strip().lower() == 'acceptance criteria':
+                    return field['id']
+        except Exception as e:
+            logger.warning(f"Could not look up the acceptance criteria field: {str(e)}")
+        return DEFAULT_ACCEPTANCE_CRITERIA_FIELD
+        
+    def get_issue_details(self, issue_key: str, fields: Optional[List[str]] = None) -> Optional[Dict]:
         """
         Get detailed information about a JIRA issue
         
         Args:
             issue_key: The JIRA issue key (e.g., 'KAN-1')
+            fields: Only fetch and return these fields, skipping attachments
             
         Returns:
             Dict containing issue details or None if not found/accessible
         """
         try:
+            if fields:
+                raw_issue = self._request_json('GET', f'issue/{issue_key}', params={'fields': ','.join(fields)})
+                return self._build_field_data(raw_issue, fields)
+                
             # Fetch issue with expanded attachments
             issue = self.jira.issue(issue_key, expand='attachments')
+            return self._build_issue_data(issue)
             
-            # Extract custom fields and components
-            custom_fields = {}
-            components = []
+        except Exception as e:
+            logger.error(f"Error fetching issue {issue_key}: {str(e)}", exc_info=True)
+            return None
             
-            for field_name, field_value in issue.raw['fields'].items():
-                if field_name.startswith('customfield_'):
-                    if field_value:
-                        custom_fields[field_name] = field_value
-                        
-            # Process attachments if present
-            attachments_data = []
-            if hasattr(issue.fields, 'attachment') and issue.fields.attachment:
-                from .attachment_processor import AttachmentProcessor
-                processor = AttachmentProcessor(f'generated_tests/{issue_key}/attachments')
+    def search_issue_details(self, issue_keys: List[str],
+                             fields: Optional[List[str]] = None) -> Dict[str, Dict]:
+        """
+        Get detailed information about many JIRA issues with batched JQL searches
+        
+        Args:
+            issue_keys: The JIRA issue keys (e.g., ['KAN-1', 'KAN-2'])
+            fields: Only fetch and return these fields, skipping attachments
+            
+        Returns:
+            Dict mapping each issue key found to its issue details
+        """
+        issues = {}
+        for start in range(0, len(issue_keys), JIRA_SEARCH_BATCH_SIZE):
+            batch = issue_keys[start:start + JIRA_SEARCH_BATCH_SIZE]
+            jql = 'key in (%s)' % ','.join(json.dumps(key) for key in batch)
+            try:
+                if fields:
+                    for raw_issue in self._search_raw(jql, fields):
+                        issues[raw_issue['key']] = self._build_field_data(raw_issue, fields)
+                else:
+                    for issue in self.jira.search_issues(jql, maxResults=False, fields='*all', expand='attachments'):
+                        issues[issue.key] = self._build_issue_data(issue)
+            except Exception as e:
+                # One unknown key fails the whole query; callers fetch those tickets singly
+                logger.warning(f"Batch search for {len(batch)} issues failed: {str(e)}")
                 
-                attachments = [{
-                    'filename': att.filename,
-                    'content': att.content,
-                    'mime_type': att.mimeType,
-                    'created': att.created,
-                    'size': att.size,
-                    'author': att.author.displayName,
-                    'auth_header': self.jira._options['headers'].get('Authorization', '')
-                } for att in issue.fields.attachment]
+        return issues
+        
+    def _search_raw(self, jql: str, fields: List[str]):
+        """Yield raw issues matching a JQL query, page by page"""
+        start_at = 0
+        while True:
+            page = self._request_json('POST', 'search', json={
+                'jql': jql,
+                'fields': fields,
+                'startAt': start_at,
+                'maxResults': JIRA_SEARCH_PAGE_SIZE
+            })
+            raw_issues = page.get('issues', [])
+            yield from raw_issues
+            start_at += len(raw_issues)
+            if not raw_issues or start_at >= page.get('total', 0):
+                return
                 
-                attachments_data = processor.process_attachments(attachments)
-                        
-            if hasattr(issue.fields, 'components'):
-                components = [c.name for c in issue.fields.components]
-            
-            # Build comprehensive issue data
-            issue_data = {
-                'key': issue.key,
-                'summary': issue.fields.summary,
-                'description': issue.fields.description or '',
-                'attachments': attachments_data,
-                'issuetype': {
-                    'name': issue.fields.issuetype.name,
-                    'description': issue.fields.issuetype.description
-                },
-                'priority': {
-                    'name': issue.fields.priority.name if issue.fields.priority else 'Medium',
-                    'id': issue.fields.priority.id if issue.fields.priority else '3'
-                },
-                'status': {
-                    'name': issue.fields.status.name,
-                    'description': issue.fields.status.description
-                },
-                'components': components,
-                'labels': issue.fields.labels,
-                'custom_fields': custom_fields,
-                'created': issue.fields.created,
-                'updated': issue.fields.updated
-            }
+    def _request_json(self, method: str, path: str, **kwargs) -> Dict:
+        """Call the JIRA REST API and decode the response body, with orjson when available"""
+        response = self.jira._session.request(method, self.jira._get_url(path), **kwargs)
+        response.raise_for_status()
+        if orjson is not None:
+            return orjson.loads(response.content)
+        return json.loads(response.content)
+        
+    def _build_issue_data(self, issue) -> Dict:
+        """Build the issue details dict from a fetched JIRA issue"""
+        # Extract custom fields and components
+        custom_fields = {}
+        components = []
+        
+        for field_name, field_value in issue.raw['fields'].items():
+            if field_name.startswith('customfield_'):
+                if field_value:
+                    custom_fields[field_name] = field_value
+                    
+        # Process attachments if present
+        attachments_data = []
+        if hasattr(issue.fields, 'attachment') and issue.fields.attachment:
+            from .attachment_processor import AttachmentProcessor
+            processor = AttachmentProcessor(f'generated_tests/{issue.key}/attachments',
+                                            cache_dir='generated_tests/.attachment_cache')
             
-            # Add acceptance criteria if available
-            if hasattr(issue.fields, 'customfield_10029'):  # Adjust field ID as needed
-                issue_data['acceptance_criteria'] = issue.fields.customfield_10029
+            attachments = [{
+                'filename': att.filename,
+                'content': att.content,
+                'mime_type': att.mimeType,
+                'created': att.created,
+                'size': att.size,
+                'author': att.author.displayName,
+                'auth_header': self.jira._options['headers'].get('Authorization', '')
+            } for att in issue.fields.attachment]
             
-            # Add epic link if available
-            if hasattr(issue.fields, 'customfield_10014'):  # Adjust field ID as needed
-                issue_data['epic_link'] = issue.fields.customfield_10014
+            attachments_data = processor.process_attachments(attachments)
+                    
+        if hasattr(issue.fields, 'components'):
+            components = [c.name for c in issue.fields.components]
+        
+        # Build comprehensive issue data
+        issue_data = {
+            'key': issue.key,
+            'summary': issue.fields.summary,
+            'description': issue.fields.description or '',
+            'attachments': attachments_data,
+            'issuetype': {
+                'name': issue.fields.issuetype.name,
+                'description': issue.fields.issuetype.description
+            },
+            'priority': {
+                'name': issue.fields.priority.name if issue.fields.priority else 'Medium',
+                'id': issue.fields.priority.id if issue.fields.priority else '3'
+            },
+            'status': {
+                'name': issue.fields.status.name,
+                'description': issue.fields.status.description
+            },
+            'components': components,
+            'labels': issue.fields.labels,
+            'custom_fields': custom_fields,
+            'created': issue.fields.created,
+            'updated': issue.fields.updated
+        }
+        
+        # Add acceptance criteria if available
+        if hasattr(issue.fields, 'customfield_10029'):  # Adjust field ID as needed
+            issue_data['acceptance_criteria'] = issue.fields.customfield_10029
+        
+        # Add epic link if available
+        if hasattr(issue.fields, 'customfield_10014'):  # Adjust field ID as needed
+            issue_data['epic_link'] = issue.fields.customfield_10014
+        
+        # Add sprint information if available
+        if hasattr(issue.fields, 'customfield_10020'):  # Adjust field ID as needed
+            sprint_data = issue.fields.customfield_10020
+            if sprint_data:
+                issue_data['sprint'] = sprint_data[0].name if isinstance(sprint_data, list) else sprint_data
+        
+        return issue_data
             
-            # Add sprint information if available
-            if hasattr(issue.fields, 'customfield_10020'):  # Adjust field ID as needed
-                sprint_data = issue.fields.customfield_10020
-                if sprint_data:
-                    issue_data['sprint'] = sprint_data[0].name if isinstance(sprint_data, list) else sprint_data
+    def _build_field_data(self, raw_issue: Dict, fields: List[str]) -> Dict:
+        """Build issue details holding only the requested fields from a raw issue"""
+        raw_fields = raw_issue['fields']
+        issue_data = {'key': raw_issue['key']}
+        for field in fields:
+            if field == self.acceptance_criteria_field:
+                issue_data['acceptance_criteria'] = raw_fields.get(field) or ''
+            else:
+                issue_data[field] = raw_fields.get(field)
+                
+        if 'description' in issue_data:
+            issue_data['description'] = issue_data['description'] or ''
+        return issue_data
             
-            return issue_data
+    def get_issue_updated(self, issue_key: str) -> Optional[str]:
+        """
+        Get only the last-updated timestamp of a JIRA issue
+        
+        Args:
+            issue_key: The JIRA issue key (e.g., 'KAN-1')
             
+        Returns:
+            The issue's 'updated' timestamp or None if not found/accessible
+        """
+        try:
+            return self.jira.issue(issue_key, fields='updated').fields.updated
         except Exception as e:
-            logger.error(f"Error fetching issue {issue_key}: {str(e)}", exc_info=True)
+            logger.warning(f"Could not check issue {issue_key} for updates: {str(e)}")
             return None
             
     def extract_test_requirements(self, issue_data: Dict) -> Dict:
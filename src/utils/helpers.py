@@ -18,7 +18,7 @@ class HelperUtils:
             level=log_level,
             format='%(asctime)s - %(name)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s',
             handlers=[
-                logging.FileHandler(log_file),
+                logging.FileHandler(log_file, delay=True),
                 logging.StreamHandler()
             ]
         )
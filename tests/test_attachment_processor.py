@@ -0,0 +1,61 @@
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+pytest.importorskip("pytesseract")
+pytest.importorskip("fitz")
+pytest.importorskip("requests")
+
+from src.core import attachment_processor
+
+
+@pytest.fixture
+def ocr_calls(monkeypatch):
+    calls = []
+
+    def fake_ocr(image):
+        calls.append(image.size)
+        return " login button "
+
+    monkeypatch.setattr(attachment_processor, "_ocr_text", fake_ocr)
+    monkeypatch.setattr(attachment_processor, "_extraction_cache", attachment_processor.OrderedDict())
+    return calls
+
+
+@pytest.fixture
+def screenshot(tmp_path):
+    path = tmp_path / "screenshot.png"
+    Image.new("RGB", (40, 20), "white").save(path)
+    return path
+
+
+def _processor(tmp_path):
+    return attachment_processor.AttachmentProcessor(str(tmp_path / "out"), cache_dir=str(tmp_path / "cache"))
+
+
+def test_disk_hit_matches_fresh_extraction(tmp_path, screenshot, ocr_calls):
+    fresh = _processor(tmp_path)._process_file({}, screenshot)
+    attachment_processor._extraction_cache.clear()
+
+    cached = _processor(tmp_path)._process_file({}, screenshot)
+
+    assert fresh == cached == ("images", {
+        "filename": "screenshot.png",
+        "dimensions": [40, 20],
+        "format": "PNG",
+        "extracted_text": "login button",
+        "type": "screenshot",
+    })
+    assert len(ocr_calls) == 1
+
+
+def test_changed_settings_miss_the_cache(tmp_path, screenshot, ocr_calls, monkeypatch):
+    _processor(tmp_path)._process_file({}, screenshot)
+    attachment_processor._extraction_cache.clear()
+
+    monkeypatch.setattr(attachment_processor, "OCR_MAX_EDGE", 800)
+    _processor(tmp_path)._process_file({}, screenshot)
+    monkeypatch.setattr(attachment_processor, "EXTRACTION_CACHE_VERSION", 2)
+    _processor(tmp_path)._process_file({}, screenshot)
+
+    assert len(ocr_calls) == 3
+    assert len(list((tmp_path / "cache").glob("*.json"))) == 3
@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("yaml")
+
+from src.core.circuit_breaker import CircuitBreakerManager
+
+
+def _fail():
+    raise ConnectionError("down")
+
+
+def _trip(breaker, name, times=5):
+    for _ in range(times):
+        with pytest.raises(ConnectionError):
+            breaker.protected_call(name, _fail)
+
+
+def test_opens_after_five_failures_and_rejects_calls():
+    breaker = CircuitBreakerManager()
+    _trip(breaker, "svc", 4)
+    assert not breaker.is_open("svc")
+
+    _trip(breaker, "svc", 1)
+    assert breaker.is_open("svc")
+    with pytest.raises(Exception, match="Circuit breaker open for svc"):
+        breaker.protected_call("svc", lambda: "ok")
+    assert not breaker.is_open("other")
+
+
+def test_success_resets_failure_count():
+    breaker = CircuitBreakerManager()
+    _trip(breaker, "svc", 4)
+
+    assert breaker.protected_call("svc", lambda x: x * 2, 21) == 42
+    _trip(breaker, "svc", 4)
+    assert not breaker.is_open("svc")
+
+
+def test_rejected_calls_are_not_failures():
+    breaker = CircuitBreakerManager()
+    _trip(breaker, "svc")
+    state = breaker._states["svc"]
+    opened_at = state.last_failure_time
+
+    with pytest.raises(Exception, match="Circuit breaker open"):
+        breaker.protected_call("svc", _fail)
+    assert state.failure_count == 5
+    assert state.last_failure_time == opened_at
+
+
+def test_async_calls_share_the_breaker():
+    breaker = CircuitBreakerManager()
+
+    async def fail():
+        raise ConnectionError("down")
+
+    async def run():
+        for _ in range(5):
+            with pytest.raises(ConnectionError):
+                await breaker.protected_call_async("svc", fail)
+        with pytest.raises(Exception, match="Circuit breaker open"):
+            await breaker.protected_call_async("svc", fail)
+
+    asyncio.run(run())
+    assert breaker.is_open("svc")
+
+
+def test_closes_after_recovery_timeout():
+    breaker = CircuitBreakerManager()
+    breaker.recovery_timeout = 0
+    _trip(breaker, "svc")
+
+    assert not breaker.is_open("svc")
+    assert breaker.protected_call("svc", lambda: "ok") == "ok"
+
+
+def test_recovery_timeout_is_kept_in_nanoseconds():
+    breaker = CircuitBreakerManager()
+    breaker.recovery_timeout = 1.5
+
+    assert breaker.recovery_timeout == 1.5
+    assert breaker._recovery_timeout_ns == 1_500_000_000
@@ -0,0 +1,75 @@
+import json
+import os
+
+import pytest
+
+pytest.importorskip("yaml")
+
+from src.core.config_manager import CONFIG_CACHE_SUFFIX, UltimateConfigManager, _flatten
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    path = tmp_path / "config" / "test_config.yaml"
+    path.parent.mkdir()
+    path.write_text("execution:\n  timeout_base: 45\ncustom:\n  nested:\n    value: 7\n")
+    return path
+
+
+def test_parsed_config_sidecar_is_reused_until_file_changes(config_file):
+    UltimateConfigManager(str(config_file))
+    sidecar = str(config_file) + CONFIG_CACHE_SUFFIX
+    assert os.path.exists(sidecar)
+
+    # A sidecar matching the file's mtime and size is trusted over the YAML
+    with open(sidecar) as f:
+        cached = json.load(f)
+    cached['config']['execution']['timeout_base'] = 99
+    with open(sidecar, 'w') as f:
+        json.dump(cached, f)
+    assert UltimateConfigManager(str(config_file)).get('execution.timeout_base') == 99
+
+    config_file.write_text("execution:\n  timeout_base: 12\n")
+    assert UltimateConfigManager(str(config_file)).get('execution.timeout_base') == 12
+
+
+def test_missing_config_file_is_created_from_defaults(tmp_path):
+    path = tmp_path / "config" / "new_config.yaml"
+
+    manager = UltimateConfigManager(str(path))
+
+    assert path.exists()
+    assert manager.get('performance.memory_limit_mb') == 2048
+
+
+def test_get_reads_dotted_keys_and_sections(config_file):
+    manager = UltimateConfigManager(str(config_file))
+
+    assert manager.get('execution.timeout_base') == 45
+    assert manager.get('execution.mode') == 'adaptive'
+    assert manager.get('custom.nested.value') == 7
+    assert manager.get('custom.nested') == {'value': 7}
+    assert manager.get('custom.missing', 'fallback') == 'fallback'
+
+
+def test_flatten_skips_non_string_keys():
+    flat = dict(_flatten({'a': {'b': 1, 2: 'ignored'}, 3: 'ignored'}))
+
+    assert flat == {'a': {'b': 1, 2: 'ignored'}, 'a.b': 1}
+
+
+def test_scenario_lists_are_frozen(config_file):
+    manager = UltimateConfigManager(str(config_file))
+
+    login = manager.get('test_scenarios.login_form')
+    assert isinstance(login['selectors'], tuple)
+    assert 'dashboard' in login['success_indicators']
+    # The savable config keeps plain lists
+    assert isinstance(manager.config['test_scenarios']['login_form']['selectors'], list)
+
+
+def test_scenario_indicators_are_compiled(config_file):
+    login = UltimateConfigManager(str(config_file)).get('test_scenarios.login_form')
+
+    assert login['_success_re'].search("Go to your DASHBOARD")
+    assert not login['_failure_re'].search("all good")
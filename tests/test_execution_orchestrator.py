@@ -0,0 +1,75 @@
+import asyncio
+import threading
+
+import pytest
+
+orchestrator = pytest.importorskip("src.agents.execution_orchestrator")
+
+from src.core.circuit_breaker import CircuitBreakerManager
+
+
+@pytest.fixture
+def agent():
+    instance = object.__new__(orchestrator.ExecutionOrchestratorAgent)
+    instance.circuit_breaker = CircuitBreakerManager()
+    instance.max_parallel = 2
+    instance._probe_results = {}
+    instance._probe_lock = threading.Lock()
+    instance.probes = 0
+    instance.database_up = False
+
+    def check_database_connection():
+        instance.probes += 1
+        return instance.database_up
+
+    instance._check_database_connection = check_database_connection
+    return instance
+
+
+def test_unavailable_probe_opens_the_breaker(agent):
+    for _ in range(5):
+        assert not agent._check_dependency('database ready')
+    assert agent.probes == 5
+    assert agent.circuit_breaker.is_open('dependency_database')
+
+    # An open breaker reports the dependency unavailable without probing
+    assert not agent._check_dependency('database ready')
+    assert agent.probes == 5
+
+
+def test_available_probe_is_cached(agent):
+    agent.database_up = True
+
+    assert agent._check_dependency('Database seeded')
+    assert agent._check_dependency('database ready')
+    assert agent.probes == 1
+
+
+def test_test_with_unavailable_dependency_is_skipped(agent):
+    for _ in range(5):
+        agent._check_dependency('database ready')
+
+    result = asyncio.run(agent._execute_single_test({'name': 'db test', 'dependencies': ['database ready']}))
+
+    assert result['status'] == 'skipped'
+    assert result['reason'] == 'Preconditions not met'
+
+
+def test_open_dependency_is_found_before_running(agent):
+    assert agent._open_dependency(['database ready']) is None
+    for _ in range(5):
+        agent._check_dependency('database ready')
+
+    assert agent._open_dependency(['other setup', 'database ready']) == 'database ready'
+    assert agent._open_dependency(['other setup', 'api up']) is None
+
+
+def test_run_coroutine_works_inside_a_running_loop():
+    async def answer():
+        return 42
+
+    async def caller():
+        return orchestrator._run_coroutine(answer())
+
+    assert orchestrator._run_coroutine(answer()) == 42
+    assert asyncio.run(caller()) == 42
@@ -0,0 +1,122 @@
+import pytest
+
+pytest.importorskip("jira")
+pytest.importorskip("google.generativeai")
+pytest.importorskip("dotenv")
+
+import jira_ai_analyzer
+from jira_ai_analyzer import JIRAAIAnalyzer
+
+
+def _raw_issue(key):
+    return {
+        "key": key,
+        "fields": {
+            "summary": f"Summary of {key}",
+            "description": None,
+            "issuetype": {"name": "Story"},
+            "priority": {"name": "High"},
+            "status": {"name": "Open"},
+            "labels": ["ui"],
+            "components": [{"name": "Login"}],
+            "assignee": None,
+        },
+    }
+
+
+class FakeJiraClient:
+    def __init__(self, keys):
+        self.keys = keys
+        self.searches = []
+
+    def search_issues(self, jql, **kwargs):
+        self.searches.append((jql, kwargs))
+        return {"issues": [_raw_issue(key) for key in self.keys]}
+
+    def _get_json(self, path, params=None):
+        raise AssertionError(f"unexpected per-ticket fetch of {path}")
+
+
+@pytest.fixture
+def analyzer(monkeypatch):
+    for name in ("JIRA_SERVER", "JIRA_EMAIL", "JIRA_API_TOKEN", "GEMINI_API_KEY"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("LLM_CACHE_PATH", "")
+    instance = JIRAAIAnalyzer()
+    yield instance
+    instance.close()
+
+
+def test_prefetch_maps_raw_json_issues(analyzer):
+    analyzer.jira_client = FakeJiraClient(["PROJ-1", "PROJ-2"])
+
+    analyzer.prefetch_ticket_details(["PROJ-1", "PROJ-2"])
+
+    (jql, kwargs), = analyzer.jira_client.searches
+    assert jql == "key in (PROJ-1,PROJ-2)"
+    assert kwargs["json_result"] is True
+    ticket = analyzer.get_ticket_details("PROJ-1")
+    assert ticket == {
+        "key": "PROJ-1",
+        "summary": "Summary of PROJ-1",
+        "description": "",
+        "issue_type": "Story",
+        "priority": "High",
+        "status": "Open",
+        "labels": ["ui"],
+        "components": ["Login"],
+        "assignee": "Unassigned",
+    }
+    assert analyzer.get_ticket_details("PROJ-2")["key"] == "PROJ-2"
+
+
+def test_prefetch_pages_large_batches(analyzer, monkeypatch):
+    monkeypatch.setattr(jira_ai_analyzer, "JIRA_SEARCH_PAGE_SIZE", 2)
+    analyzer.jira_client = FakeJiraClient([])
+
+    analyzer.prefetch_ticket_details(["A-1", "A-2", "A-3"])
+
+    assert [jql for jql, _ in analyzer.jira_client.searches] == ["key in (A-1,A-2)", "key in (A-3)"]
+
+
+@pytest.mark.parametrize("backend", ["diskcache", "shelve"])
+def test_llm_cache_survives_reopen(tmp_path, monkeypatch, backend):
+    if backend == "diskcache":
+        pytest.importorskip("diskcache")
+    else:
+        monkeypatch.setattr(jira_ai_analyzer, "diskcache", None)
+    path = str(tmp_path / "llm_cache")
+
+    cache = jira_ai_analyzer.LLMCache(persist_path=path)
+    assert cache._store is not None
+    cache.set("key", [{"name": "cached"}])
+    cache._store.close()
+
+    reopened = jira_ai_analyzer.LLMCache(persist_path=path)
+    assert reopened._store is not None
+    assert reopened.get("key") == [{"name": "cached"}]
+    reopened._store.close()
+
+
+def test_llm_cache_prunes_expired_entries_on_open(tmp_path):
+    pytest.importorskip("diskcache")
+    path = str(tmp_path / "llm_cache")
+    cache = jira_ai_analyzer.LLMCache(persist_path=path)
+    cache._store["stale"] = (0.0, "old")
+    cache._store.close()
+
+    reopened = jira_ai_analyzer.LLMCache(persist_path=path)
+    assert "stale" not in reopened._store
+    reopened._store.close()
+
+
+@pytest.mark.parametrize("written", [True, False])
+def test_result_is_cached_only_after_scripts_are_written(analyzer, monkeypatch, written):
+    monkeypatch.setattr(analyzer, "create_test_scripts", lambda test_cases, ticket_id: written)
+    ticket = analyzer._issue_to_ticket_data(_raw_issue("PROJ-1"))
+    test_case = {"name": "Login works", "steps": ["Log in"], "expected_result": "Dashboard shown"}
+
+    result = analyzer._complete_analysis(ticket, [test_case], "PROJ-1", "result-key")
+    analyzer.close()
+
+    assert (analyzer.result_cache.get("result-key") == result) is written
@@ -0,0 +1,56 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("dotenv")
+
+import jira_analyzer_cli
+import jira_analyzer_cli_new
+
+
+class RecordingValidator:
+    def __init__(self):
+        self.checked = []
+
+    def is_ticket_accessible(self, ticket_id):
+        self.checked.append(ticket_id)
+        return True
+
+
+@pytest.fixture
+def analyzer():
+    instance = object.__new__(jira_analyzer_cli.JiraAnalyzer)
+    instance.jira_client = SimpleNamespace(validator=RecordingValidator())
+    instance.processed = []
+    instance.process_ticket = lambda ticket_id, options: instance.processed.append(ticket_id)
+    return instance
+
+
+@pytest.fixture
+def generator_cli():
+    instance = object.__new__(jira_analyzer_cli_new.TestCaseGeneratorCLI)
+    instance.processed = []
+    instance.process_ticket = lambda ticket_id, options: instance.processed.append(ticket_id)
+    return instance
+
+
+@pytest.mark.parametrize("ticket_id", ["PROJ-123", "proj-123", "Ab1-9"])
+def test_valid_ticket_ids_are_processed_uppercase(analyzer, ticket_id):
+    assert analyzer.validate_and_process_ticket(ticket_id)
+    assert analyzer.jira_client.validator.checked == [ticket_id.upper()]
+    assert analyzer.processed == [ticket_id.upper()]
+
+
+@pytest.mark.parametrize("ticket_id", ["", "PROJ", "PROJ-", "1PROJ-2", "PROJ-12a", "https://x/browse/PROJ-1"])
+def test_malformed_ticket_ids_skip_jira(analyzer, ticket_id):
+    assert not analyzer.validate_and_process_ticket(ticket_id)
+    assert analyzer.jira_client.validator.checked == []
+
+
+def test_batch_normalizes_case_and_drops_invalid_lines(generator_cli, tmp_path):
+    batch_file = tmp_path / "tickets.txt"
+    batch_file.write_text("proj-1\n\nPROJ-1\n# comment\n  abc-22  \nnot a ticket\n")
+
+    generator_cli.process_batch(str(batch_file))
+
+    assert sorted(generator_cli.processed) == ["ABC-22", "PROJ-1"]